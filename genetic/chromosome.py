@@ -3,12 +3,13 @@ class Chromosome:
     Represents a single room in building layout
     """
 
-    def __init__(self, room_type, x, y,width,height):
+    def __init__(self, room_type, x, y,width,height, floor=0):
         self.room_type = room_type
         self.x = x
         self.y = y
         self.width = width
         self.height = height
+        self.floor = floor
 
     def get_area(self):
         return self.width * self.height
@@ -18,4 +19,4 @@ class Chromosome:
 
     def __repr__(self):
         return (f"Chromosome(type='{self.room_type}', x={self.x}, y={self.y}, "
-                f"w={self.width}, h={self.height})")
+                f"w={self.width}, h={self.height}, floor={self.floor})")
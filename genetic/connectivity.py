@@ -0,0 +1,42 @@
+class UnionFind:
+    """
+    Array-backed disjoint set with union by size and path halving
+    """
+
+    def __init__(self, n):
+        self.parent = list(range(n))
+        self.size = [1] * n
+        self.components = n
+
+    def find(self, i):
+        parent = self.parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(self, i, j):
+        root_i, root_j = self.find(i), self.find(j)
+        if root_i == root_j:
+            return False
+        if self.size[root_i] < self.size[root_j]:
+            root_i, root_j = root_j, root_i
+        self.parent[root_j] = root_i
+        self.size[root_i] += self.size[root_j]
+        self.components -= 1
+        return True
+
+
+def count_label_components(labels):
+    """
+    Counts connected components when items sharing the same label are connected to each other.
+    """
+
+    uf = UnionFind(len(labels))
+    first_with_label = {}
+    for i, label in enumerate(labels):
+        first = first_with_label.setdefault(label, i)
+        if first != i:
+            uf.union(first, i)
+    return uf.components
+
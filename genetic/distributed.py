@@ -0,0 +1,257 @@
+import copy
+import random
+import time
+
+import numpy as np
+
+from genetic.evolution import STAGNATION_NUM, breed_pair, evaluate_floor_tasks, evaluate_local
+from genetic.faults import report_failures
+from genetic.floors import compute_vertical_alignment_score, floor_configs, is_multi_floor, split_by_floor
+from genetic.hybrid import LocalEvaluator, workers_per_rank
+from genetic.operators import fitness_key
+from genetic.rng import stream_random, STAGE_BREED
+
+SELECTION_QUANTILE = 0.5
+MIGRANTS = 2
+
+
+def shard_bounds(population_size, size):
+    """
+    Returns the (start, stop) global indices of the shard owned by each rank.
+    """
+
+    counts = [len(chunk) for chunk in np.array_split(np.arange(population_size), size)]
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    return [(int(start), int(start + count)) for start, count in zip(starts, counts)]
+
+
+def evaluate_shard(shard, config_data, local_evaluator=None, timeout=None, failures=None):
+    """
+    Evaluates the individuals of a shard that have no fitness yet; elites kept from the last generation are skipped.
+    """
+
+    pending = [individual for individual in shard if individual.fitness is None]
+    if not is_multi_floor(config_data):
+        fitnesses = evaluate_local(pending, config_data, local_evaluator, False, timeout, failures)
+    else:
+        configs = floor_configs(config_data)
+        tasks = [
+            (index, floor, floor_individual)
+            for index, individual in enumerate(pending)
+            for floor, floor_individual in enumerate(split_by_floor(individual, len(configs)))
+        ]
+        fitnesses = [
+            compute_vertical_alignment_score(individual, config_data.get("vertical_alignment", []))
+            for individual in pending
+        ]
+        for index, objectives in evaluate_floor_tasks(tasks, configs, local_evaluator, timeout, failures):
+            fitnesses[index] += float(np.sum(objectives))
+
+    for individual, fitness in zip(pending, fitnesses):
+        individual.fitness = float(fitness)
+    return len(pending)
+
+
+def gather_fitness(shard, comm, bounds):
+    """
+    Gathers the fitness of every individual in global index order on all ranks, without pickling.
+    """
+
+    from mpi4py import MPI
+
+    local = np.array([individual.fitness for individual in shard], dtype=np.float64)
+    counts = [stop - start for start, stop in bounds]
+    fitnesses = np.empty(sum(counts), dtype=np.float64)
+    comm.Allgatherv(local, [fitnesses, counts, [start for start, _ in bounds], MPI.DOUBLE])
+    return fitnesses
+
+
+def send_best_to_root(shard, comm, bounds, best_index):
+    """
+    Moves the individual at a global index to rank 0, returning a copy of it there and None elsewhere.
+    """
+
+    rank = comm.Get_rank()
+    owner = next(r for r, (start, stop) in enumerate(bounds) if start <= best_index < stop)
+
+    if owner == rank:
+        best = copy.deepcopy(shard[best_index - bounds[rank][0]])
+        if rank == 0:
+            return best
+        comm.send(best, dest=0, tag=920)
+        return None
+    if rank == 0:
+        return comm.recv(source=owner, tag=920)
+    return None
+
+
+def migrate(shard, comm, count):
+    """
+    Sends copies of a shard's best individuals to the next rank in a ring and returns those received from the previous one.
+    """
+
+    rank = comm.Get_rank()
+    size = comm.Get_size()
+    if size == 1:
+        return []
+
+    emigrants = [copy.deepcopy(ind) for ind in sorted(shard, key=fitness_key, reverse=True)[:count]]
+    return comm.sendrecv(emigrants, dest=(rank + 1) % size, source=(rank - 1) % size)
+
+
+def gather_elites(shard, comm, bounds, fitnesses, count):
+    """
+    Collects copies of the count best individuals of the whole population on rank 0, best first.
+
+    The elites are ranked from the gathered fitness of every individual, so each rank sends only those it owns.
+    """
+
+    start, stop = bounds[comm.Get_rank()]
+    elite_indices = [int(i) for i in np.argsort(-fitnesses, kind='stable')[:count]]
+    owned = [(i, copy.deepcopy(shard[i - start])) for i in elite_indices if start <= i < stop]
+    gathered = comm.gather(owned, root=0)
+    if gathered is None:
+        return None
+    elites = dict(pair for chunk in gathered for pair in chunk)
+    return [elites[i] for i in elite_indices]
+
+
+def run_evolution_distributed(
+    shard,
+    config_data,
+    num_generations,
+    population_size,
+    tournament_size,
+    crossover_prob,
+    mutation_prob,
+    early_stopping,
+    comm,
+    elite_fraction=0.02,
+    repair_prob=0.0,
+    local_workers=0,
+    evaluation_timeout=None,
+    telemetry=None,
+    seed=None,
+    debug=False
+):
+    """
+    Runs the evolutionary loop with the population kept distributed, each rank owning its shard end to end.
+
+    Ranks only exchange fitness values (one Allgatherv per generation), a few migrants with their ring
+    neighbours, and the best individual, so no rank ever holds the whole population. The global elites
+    and the parent pool (shard members at or above the global fitness median, plus the migrants) are
+    chosen from the gathered fitness values. Rank 0 holds only the hall of fame, the final elites and
+    the statistics. With a seed the trajectory is reproducible for a given number of ranks.
+    """
+
+    rank = comm.Get_rank()
+    size = comm.Get_size()
+    if seed is None:
+        random.seed(42 + rank)
+
+    bounds = shard_bounds(population_size, size)
+    start, stop = bounds[rank]
+    num_elites = max(1, int(elite_fraction * population_size))
+
+    if local_workers < 0:
+        local_workers = workers_per_rank(comm)
+    local_evaluator = LocalEvaluator(config_data, local_workers) if local_workers > 0 else None
+
+    best_fitness = float('-inf')
+    stagnation_counter = 0
+    hall_of_fame = []
+
+    if rank == 0 and debug:
+        print("Starting distributed evolution...")
+
+    for generation in range(num_generations):
+        generation_start = time.perf_counter()
+        failures = []
+        eval_start = time.perf_counter()
+        evaluations = evaluate_shard(shard, config_data, local_evaluator, evaluation_timeout, failures)
+        eval_seconds = time.perf_counter() - eval_start
+
+        fitnesses = gather_fitness(shard, comm, bounds)
+        order = np.argsort(-fitnesses, kind='stable')
+        current_best = float(fitnesses[order[0]])
+        best = send_best_to_root(shard, comm, bounds, int(order[0]))
+
+        all_failures = comm.gather(failures, root=0)
+        rank_eval_seconds = comm.gather(eval_seconds, root=0)
+        total_evaluations = comm.reduce(evaluations, root=0)
+
+        if current_best > best_fitness:
+            best_fitness = current_best
+            stagnation_counter = 0
+        else:
+            stagnation_counter += 1
+
+        if rank == 0:
+            hall_of_fame.append(best)
+            avg_fitness = float(fitnesses.mean())
+            report_failures([reason for rank_failures in all_failures for reason in rank_failures])
+
+            if telemetry is not None:
+                slowest = max(rank_eval_seconds)
+                telemetry.emit({
+                    'generation': generation + 1,
+                    'best_fitness': current_best,
+                    'avg_fitness': avg_fitness,
+                    'std_fitness': float(fitnesses.std()),
+                    'evaluations': total_evaluations,
+                    'evaluations_per_second': total_evaluations / slowest if slowest > 0 else 0.0,
+                    'generation_seconds': time.perf_counter() - generation_start,
+                    'rank_eval_seconds': rank_eval_seconds,
+                    'failed_evaluations': sum(len(rank_failures) for rank_failures in all_failures),
+                })
+
+            if debug:
+                print(f"Generation {generation + 1}: avg = {avg_fitness:.4f}, best = {current_best:.4f}")
+
+        # Every rank sees the same fitness values, so all reach the same stopping decision without a broadcast
+        if stagnation_counter >= STAGNATION_NUM and early_stopping:
+            if rank == 0:
+                print(f"Early stopping at generation {generation + 1} due to stagnation.")
+            break
+
+        elite_indices = np.sort(order[:num_elites])
+        elites = [shard[i - start] for i in elite_indices[(elite_indices >= start) & (elite_indices < stop)]]
+
+        migrants = migrate(shard, comm, MIGRANTS)
+        threshold = np.quantile(fitnesses, SELECTION_QUANTILE)
+        parents = [ind for ind in shard if ind.fitness >= threshold] + migrants
+        if len(parents) < 2:
+            parents = shard + migrants
+
+        num_children = len(shard) - len(elites)
+        children = []
+        pair_index = 0
+        while len(children) < num_children:
+            rng = random if seed is None else stream_random(seed, STAGE_BREED, generation, start + pair_index)
+            children.extend(breed_pair(
+                parents, config_data, tournament_size, crossover_prob, mutation_prob,
+                fitness_key, rng, copy.deepcopy, repair_prob
+            ))
+            pair_index += 1
+
+        for child in children:
+            child.fitness = None
+        shard = elites + children[:num_children]
+
+    failures = []
+    evaluate_shard(shard, config_data, local_evaluator, evaluation_timeout, failures)
+    if local_evaluator is not None:
+        local_evaluator.close()
+
+    fitnesses = gather_fitness(shard, comm, bounds)
+    best = send_best_to_root(shard, comm, bounds, int(np.argmax(fitnesses)))
+    final_elites = gather_elites(shard, comm, bounds, fitnesses, num_elites)
+    all_failures = comm.gather(failures, root=0)
+
+    if rank == 0:
+        report_failures([reason for rank_failures in all_failures for reason in rank_failures])
+        print("Evolution finished.")
+        hall_of_fame.append(best)
+        return final_elites, hall_of_fame
+
+    return None, None
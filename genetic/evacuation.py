@@ -0,0 +1,91 @@
+import math
+
+import numpy as np
+
+from genetic.geometry import building_grid
+
+UNREACHABLE_PENALTY = 100
+DISTANCE_WEIGHT = 2
+
+
+def distance_field(open_cells, sources):
+    """
+    Computes 4-connected BFS distances from all source cells through open cells; unreachable cells get -1.
+    """
+
+    distance = np.full(open_cells.shape, -1, dtype=np.int64)
+    frontier = sources & open_cells
+    step = 0
+    while frontier.any():
+        distance[frontier] = step
+        grown = np.zeros_like(frontier)
+        grown[1:, :] |= frontier[:-1, :]
+        grown[:-1, :] |= frontier[1:, :]
+        grown[:, 1:] |= frontier[:, :-1]
+        grown[:, :-1] |= frontier[:, 1:]
+        frontier = grown & open_cells & (distance < 0)
+        step += 1
+    return distance
+
+
+def room_cell_bounds(room, origin_x, origin_y, rows, cols):
+    x0 = min(max(room.x - origin_x, 0), cols)
+    x1 = min(max(room.x + room.width - origin_x, 0), cols)
+    y0 = min(max(room.y - origin_y, 0), rows)
+    y1 = min(max(room.y + room.height - origin_y, 0), rows)
+    return x0, x1, y0, y1
+
+
+def compute_evacuation_score(chromosomes, building_outline, entrances) -> float:
+    """
+    Penalizes the walking distance through corridor space from every room to the nearest entrance.
+    """
+
+    if not entrances or not chromosomes:
+        return 0.0
+
+    outline = tuple((p['x'], p['y']) for p in building_outline)
+    origin_x, origin_y, inside = building_grid(outline, "centre")
+    rows, cols = inside.shape
+
+    corridor = inside.copy()
+    room_bounds = []
+    for room in chromosomes:
+        x0, x1, y0, y1 = room_cell_bounds(room, origin_x, origin_y, rows, cols)
+        corridor[y0:y1, x0:x1] = False
+        room_bounds.append((x0, x1, y0, y1))
+
+    # Corridor cells touching an entrance point are the BFS sources
+    sources = np.zeros_like(corridor)
+    for entrance in entrances:
+        ex, ey = entrance['x'] - origin_x, entrance['y'] - origin_y
+        for cx in range(math.ceil(ex) - 1, math.floor(ex) + 1):
+            for cy in range(math.ceil(ey) - 1, math.floor(ey) + 1):
+                if 0 <= cx < cols and 0 <= cy < rows:
+                    sources[cy, cx] = True
+
+    distance = distance_field(corridor, sources)
+
+    score = 0.0
+    for room, (x0, x1, y0, y1) in zip(chromosomes, room_bounds):
+        if any(room.x <= e['x'] <= room.x + room.width and room.y <= e['y'] <= room.y + room.height
+               for e in entrances):
+            continue
+
+        ring = []
+        if x0 > 0:
+            ring.append(distance[y0:y1, x0 - 1])
+        if x1 < cols:
+            ring.append(distance[y0:y1, x1])
+        if y0 > 0:
+            ring.append(distance[y0 - 1, x0:x1])
+        if y1 < rows:
+            ring.append(distance[y1, x0:x1])
+
+        reachable = np.concatenate(ring) if ring else np.empty(0, dtype=np.int64)
+        reachable = reachable[reachable >= 0]
+        if len(reachable):
+            score -= (reachable.min() + 1) * DISTANCE_WEIGHT
+        else:
+            score -= UNREACHABLE_PENALTY
+    return score
@@ -1,15 +1,36 @@
 import math
 from itertools import combinations
 from typing import Dict, List, Tuple
-import networkx as nx
+import numpy as np
+import shapely
 from shapely.geometry import Polygon, box
-from shapely.ops import unary_union
+
+from genetic.connectivity import count_label_components
+from genetic.evacuation import compute_evacuation_score
+from genetic.geometry import LayoutGeometry, outline_polygon
+from genetic.kernels import get_backend, pairwise_terms
+
+OBJECTIVE_GROUPS = {
+    'feasibility': ['1. overlap_penalty', '2. area_penalty', '3. boundary_penalty', '8. aspect_penalty'],
+    'adjacency': ['4. adjacency_score', '5. separation_score', '9. shared_wall_score'],
+    'space_usage': ['6. usage_score', '7. wall_contact_score'],
+    'corridor_quality': ['10. corridor_connectivity_score', '11. straight_corridor_score', '12. evacuation_score'],
+}
 
 
 def get_room_box(room):
     return box(room.x, room.y, room.x + room.width, room.y + room.height)
 
 
+def get_room_boxes(chromosomes):
+    """
+    Builds the boxes of all rooms with a single vectorized call, keyed by room.
+    """
+
+    bounds = np.array([(r.x, r.y, r.x + r.width, r.y + r.height) for r in chromosomes], dtype=float).reshape(-1, 4)
+    return dict(zip(chromosomes, shapely.box(bounds[:, 0], bounds[:, 1], bounds[:, 2], bounds[:, 3]).tolist()))
+
+
 def get_room_center(room):
     return room.x + room.width / 2, room.y + room.height / 2
 
@@ -42,15 +63,14 @@ def penalize_area(chromosomes, min_area: Dict[str, float]):
     return penalty
 
 
-def penalize_boundary(room_boxes: Dict, building_poly: Polygon):
+def penalize_boundary(geometry: LayoutGeometry):
     """
     Penalizes rooms that extend beyond the boundaries of the building.
     """
 
     penalty = 0.0
-    for room_box in room_boxes.values():
-        if not building_poly.covers(room_box):
-            outside_area = room_box.difference(building_poly).area
+    for outside_area in geometry.outside_areas.values():
+        if outside_area is not None:
             penalty -= 500 + outside_area * 50
     return penalty
 
@@ -124,14 +144,13 @@ def compute_usage_score(chromosomes, building_poly: Polygon):
     return score
 
 
-def compute_wall_contact_score(room_boxes: Dict, building_poly: Polygon) -> float:
+def compute_wall_contact_score(geometry: LayoutGeometry) -> float:
     """
     Rewards rooms that have direct contact with the building's external walls.
     """
 
     score = 0.0
-    for room_box in room_boxes.values():
-        contact_length = room_box.intersection(building_poly.exterior).length
+    for contact_length in geometry.exterior_contact_lengths.values():
         score += contact_length * 5
         score += 30 if contact_length > 0 else -20
     return score
@@ -172,43 +191,20 @@ def compute_shared_wall_score(room_pairs, room_boxes, corridor_width: float) ->
     return score
 
 
-def calculate_corridor_connectivity_score(room_boxes: Dict, building_poly: Polygon) -> float:
+def calculate_corridor_connectivity_score(geometry: LayoutGeometry) -> float:
     """
     Scores the connectivity of rooms via corridors, penalizing disconnected or isolated layouts.
     """
 
-    corridor_area = building_poly.difference(unary_union(list(room_boxes.values())))
-
-    if corridor_area.is_empty:
+    if geometry.corridor_area.is_empty:
         return -500
 
-    corridor_polygons = list(corridor_area.geoms) if corridor_area.geom_type == 'MultiPolygon' else [corridor_area]
-    num_corridors = len(corridor_polygons)
-
-    room_corridor_map = {}
-    rooms_without_corridor = 0
-
-    for room, room_box in room_boxes.items():
-        connected = False
-        for i, corridor in enumerate(corridor_polygons):
-            if room_box.exterior.intersects(corridor):
-                room_corridor_map[room] = i
-                connected = True
-                break
-        if not connected:
-            rooms_without_corridor += 1
-
-    G = nx.Graph()
-    G.add_nodes_from(room_boxes.keys())
+    num_corridors = len(geometry.corridor_polygons)
+    room_corridor_map = geometry.room_corridor_map
+    rooms_without_corridor = len(geometry.room_boxes) - len(room_corridor_map)
 
-    for r1, r2 in combinations(room_boxes.keys(), 2):
-        if room_corridor_map.get(r1) == room_corridor_map.get(r2):
-            G.add_edge(r1, r2)
-
-    if len(G.nodes) > 0:
-        num_components = nx.number_connected_components(G)
-    else:
-        num_components = len(room_boxes)
+    # Rooms are connected when they open onto the same corridor; rooms without a corridor form one group
+    num_components = count_label_components([room_corridor_map.get(room) for room in geometry.room_boxes])
 
     disconnected_penalty = -75 * (num_components - 1)
     dead_corridor_penalty = -150 * (num_corridors - 1)
@@ -218,19 +214,17 @@ def calculate_corridor_connectivity_score(room_boxes: Dict, building_poly: Polyg
     return final_score
 
 
-def reward_straight_corridors(room_boxes: Dict, building_poly: Polygon) -> float:
+def reward_straight_corridors(geometry: LayoutGeometry) -> float:
     """
     Rewards straight and efficient corridor shapes based on their rectangularity.
     """
 
-    corridor_area = building_poly.difference(unary_union(list(room_boxes.values())))
-    if corridor_area.is_empty:
+    if geometry.corridor_area.is_empty:
         return 0
 
-    corridors = list(corridor_area.geoms) if corridor_area.geom_type == 'MultiPolygon' else [corridor_area]
     score = 0.0
 
-    for corridor in corridors:
+    for corridor in geometry.corridor_polygons:
         minx, miny, maxx, maxy = corridor.bounds
         bbox_area = (maxx - minx) * (maxy - miny)
         actual_area = corridor.area
@@ -247,43 +241,102 @@ def reward_straight_corridors(room_boxes: Dict, building_poly: Polygon) -> float
     return score
 
 
-def calculate_fitness(individual, config_data, debug=False):
+def calculate_scores(individual, config_data):
     """
-    Calculates the overall fitness score of a room layout based on spatial and design constraints.
+    Calculates every individual score term of a room layout.
     """
 
     chromosomes = individual.chromosomes
     min_area = {r['type']: r.get('min_area', 0) for r in config_data.get('rooms', [])}
-    building_poly = Polygon([(p['x'], p['y']) for p in config_data.get('building_constraints', [])])
+    building_poly = outline_polygon(config_data.get('building_constraints', []))
 
-    room_boxes = {room: get_room_box(room) for room in chromosomes}
+    room_boxes = get_room_boxes(chromosomes)
     room_centers = {room: get_room_center(room) for room in chromosomes}
     room_pairs = list(combinations(chromosomes, 2))
+    geometry = LayoutGeometry(room_boxes, building_poly)
 
     adjacency_requirements = config_data.get('adjacency_requirements', [])
     separation_requirements = config_data.get('separation_requirements', [])
     corridor_width = config_data.get("corridor_width", 1.0)
 
+    backend = get_backend()
+    if backend is None:
+        shared_wall_score = compute_shared_wall_score(room_pairs, room_boxes, corridor_width)
+        adjacency_score = compute_adjacency_score(chromosomes, room_centers, adjacency_requirements)
+    else:
+        shared_wall_score, adjacency_score = pairwise_terms(
+            backend, chromosomes, adjacency_requirements, corridor_width
+        )
+
     scores = {
         '1. overlap_penalty': penalize_overlaps(room_pairs, room_boxes),
         '2. area_penalty': penalize_area(chromosomes, min_area),
-        '3. boundary_penalty': penalize_boundary(room_boxes, building_poly),
-        '4. adjacency_score': compute_adjacency_score(chromosomes, room_centers, adjacency_requirements),
+        '3. boundary_penalty': penalize_boundary(geometry),
+        '4. adjacency_score': adjacency_score,
         '5. separation_score': compute_separation_score(chromosomes, room_centers, separation_requirements),
         '6. usage_score': compute_usage_score(chromosomes, building_poly),
-        '7. wall_contact_score': compute_wall_contact_score(room_boxes, building_poly),
+        '7. wall_contact_score': compute_wall_contact_score(geometry),
         '8. aspect_penalty': penalize_aspect_ratio(chromosomes),
-        '9. shared_wall_score': compute_shared_wall_score(room_pairs, room_boxes, corridor_width),
-        '10. corridor_connectivity_score': calculate_corridor_connectivity_score(room_boxes, building_poly),
-        '11. straight_corridor_score': reward_straight_corridors(room_boxes, building_poly),
+        '9. shared_wall_score': shared_wall_score,
+        '10. corridor_connectivity_score': calculate_corridor_connectivity_score(geometry),
+        '11. straight_corridor_score': reward_straight_corridors(geometry),
+        '12. evacuation_score': compute_evacuation_score(
+            chromosomes, config_data.get('building_constraints', []), config_data.get('entrances', [])
+        ),
     }
 
+    return scores
+
+
+def calculate_fitness(individual, config_data, debug=False):
+    """
+    Calculates the overall fitness score of a room layout based on spatial and design constraints.
+    """
+
+    scores = calculate_scores(individual, config_data)
+
     if debug:
         print_scores(scores)
 
     return sum(scores.values())
 
 
+def calculate_objectives(individual, config_data):
+    """
+    Calculates the objective vector of a room layout by summing score terms within each objective group.
+    """
+
+    scores = calculate_scores(individual, config_data)
+    return np.array([sum(scores[key] for key in keys) for keys in OBJECTIVE_GROUPS.values()])
+
+
+def calculate_surrogate_fitness(individual, config_data):
+    """
+    Cheaply approximates the fitness using only the room-wise and pairwise terms, skipping corridor analysis.
+    """
+
+    chromosomes = individual.chromosomes
+    min_area = {r['type']: r.get('min_area', 0) for r in config_data.get('rooms', [])}
+    building_poly = outline_polygon(config_data.get('building_constraints', []))
+
+    room_boxes = get_room_boxes(chromosomes)
+    room_centers = {room: get_room_center(room) for room in chromosomes}
+    room_pairs = list(combinations(chromosomes, 2))
+
+    adjacency_requirements = config_data.get('adjacency_requirements', [])
+    separation_requirements = config_data.get('separation_requirements', [])
+
+    return (
+        penalize_overlaps(room_pairs, room_boxes)
+        + penalize_area(chromosomes, min_area)
+        + penalize_boundary(LayoutGeometry(room_boxes, building_poly))
+        + compute_adjacency_score(chromosomes, room_centers, adjacency_requirements)
+        + compute_separation_score(chromosomes, room_centers, separation_requirements)
+        + compute_usage_score(chromosomes, building_poly)
+        + penalize_aspect_ratio(chromosomes)
+    )
+
+
 def print_scores(scores: Dict[str, float]):
     print("\n=== Fitness Breakdown ===")
     for key, value in scores.items():
@@ -1,18 +1,74 @@
 import numpy as np
 import copy
 import random
-
-from genetic.evaluator import calculate_fitness
-from genetic.operators import tournament_selection, crossover, mutate
+import time
+
+from genetic.evaluator import calculate_fitness, calculate_surrogate_fitness, calculate_objectives, OBJECTIVE_GROUPS
+from genetic.operators import tournament_selection, crossover, fitness_key
+from genetic.local_search import refine_elites_parallel
+from genetic.surrogate import SurrogateModel, rank_correlation
+from genetic.pareto import assign_pareto_ranks, select_survivors, update_pareto_archive, crowded_comparison_key
+from genetic.rng import stream_random, STAGE_BREED
+from genetic.hybrid import LocalEvaluator, workers_per_rank
+from genetic.faults import TaskDispatcher, guarded, report_failures
+from genetic.floors import (
+    is_multi_floor, floor_configs, split_by_floor, compute_vertical_alignment_score, mutate_building,
+    repair_building
+)
 
 STAGNATION_NUM = 10
 
 
-def evaluate_population_parallel(population, config_data, comm):
+def evaluate_local(
+    individuals, config_data, local_evaluator=None, objectives=False, timeout=None, failures=None, dispatcher=None
+):
+    """
+    Evaluates a rank's individuals, on its local worker pool if it has one, or on all ranks through a dispatcher.
+
+    Individuals whose evaluation raises or exceeds the timeout get a penalty score and their reason is
+    appended to failures.
+    """
+
+    if dispatcher is not None:
+        values, dispatch_failures = dispatcher.map('objectives' if objectives else 'fitness', list(individuals))
+        if failures is not None:
+            failures.extend(dispatch_failures)
+        return values
+    if local_evaluator is not None:
+        return local_evaluator.evaluate(individuals, objectives, timeout=timeout, failures=failures)
+    evaluate = calculate_objectives if objectives else calculate_fitness
+    return [guarded(evaluate, individual, config_data, timeout, failures, objectives) for individual in individuals]
+
+
+def evaluate_population_parallel(
+    population,
+    config_data,
+    comm,
+    surrogate=None,
+    multi_objective=False,
+    stats=None,
+    local_evaluator=None,
+    evaluation_timeout=None,
+    dispatcher=None
+):
     """
     Evaluates fitness of the population in parallel using MPI.
+
+    When a surrogate model is given, the population is ranked by the cheap surrogate score across all ranks
+    and only the most promising fraction is fully evaluated; the rest receive predicted fitness.
+    In multi-objective mode the objective vector is stored as well and fitness is its sum.
+    If a stats dict is given, rank 0 fills it with per-rank evaluation times, the number of full evaluations
+    and the number of failed evaluations.
+    If a local evaluator is given, each rank spreads its chunk over its own worker processes.
+    If a dispatcher is given, comm holds rank 0 alone and the full evaluations are handed out in batches
+    to the ranks serving the dispatcher.
     """
 
+    if is_multi_floor(config_data):
+        return evaluate_floors_parallel(
+            population, config_data, comm, multi_objective, stats, local_evaluator, evaluation_timeout, dispatcher
+        )
+
     rank = comm.Get_rank()
     size = comm.Get_size()
 
@@ -22,14 +78,299 @@ def evaluate_population_parallel(population, config_data, comm):
         data = None
 
     local_chunk = comm.scatter(data, root=0)
+    start_time = time.perf_counter()
+    failures = []
+
+    if multi_objective:
+        objectives = evaluate_local(
+            local_chunk, config_data, local_evaluator, True, evaluation_timeout, failures, dispatcher
+        )
+        for individual, individual_objectives in zip(local_chunk, objectives):
+            individual.objectives = individual_objectives
+            individual.fitness = float(individual.objectives.sum())
+        local_samples = None
+    elif surrogate is None:
+        fitnesses = evaluate_local(
+            local_chunk, config_data, local_evaluator, False, evaluation_timeout, failures, dispatcher
+        )
+        for individual, fitness in zip(local_chunk, fitnesses):
+            individual.fitness = float(fitness)
+        local_samples = None
+    else:
+        surrogate_scores = np.array([
+            guarded(calculate_surrogate_fitness, ind, config_data, evaluation_timeout, failures) for ind in local_chunk
+        ])
+        all_scores = comm.allgather(surrogate_scores)
+        offset = sum(len(scores) for scores in all_scores[:rank])
+        global_scores = np.concatenate(all_scores)
+
+        num_full = surrogate.num_full_evaluations(len(global_scores))
+        order = np.argsort(-global_scores, kind='stable')
+        selected = np.zeros(len(global_scores), dtype=bool)
+        selected[order[:num_full]] = True
+        fully_evaluated = selected[offset:offset + len(local_chunk)]
+        predicted = surrogate.predict(surrogate_scores)
+
+        full_chunk = [individual for i, individual in enumerate(local_chunk) if fully_evaluated[i]]
+        full_fitnesses = iter(
+            evaluate_local(full_chunk, config_data, local_evaluator, False, evaluation_timeout, failures, dispatcher)
+        )
+        for i, individual in enumerate(local_chunk):
+            if fully_evaluated[i]:
+                individual.fitness = float(next(full_fitnesses))
+            else:
+                individual.fitness = float(predicted[i])
+        local_samples = (surrogate_scores, predicted, fully_evaluated)
+
+    elapsed = time.perf_counter() - start_time
+    gathered = comm.gather((local_chunk, local_samples, elapsed, failures), root=0)
+
+    if rank == 0:
+        evaluated = [individual for chunk, _, _, _ in gathered for individual in chunk]
+        gathered_samples = [samples for _, samples, _, _ in gathered]
+        all_failures = [reason for _, _, _, rank_failures in gathered for reason in rank_failures]
+        report_failures(all_failures)
+        if local_samples is not None:
+            update_surrogate(surrogate, evaluated, gathered_samples)
+        if stats is not None:
+            if dispatcher is not None:
+                stats['rank_eval_seconds'] = dispatcher.rank_seconds
+            else:
+                stats['rank_eval_seconds'] = [rank_elapsed for _, _, rank_elapsed, _ in gathered]
+            stats['full_evaluations'] = sum(
+                len(chunk) if samples is None else int(samples[2].sum()) for chunk, samples, _, _ in gathered
+            )
+            stats['failed_evaluations'] = len(all_failures)
+        return evaluated
+    return None
+
+
+def evaluate_floor_tasks(tasks, configs, local_evaluator=None, timeout=None, failures=None, dispatcher=None):
+    """
+    Computes the objectives of (index, floor, floor individual) tasks, each against its own floor's configuration.
+    """
+
+    if dispatcher is not None:
+        results, dispatch_failures = dispatcher.map('floors', tasks)
+        if failures is not None:
+            failures.extend(dispatch_failures)
+        return results
+    if local_evaluator is not None:
+        objectives = local_evaluator.evaluate(
+            [floor_individual for _, _, floor_individual in tasks],
+            objectives=True,
+            floors=[floor for _, floor, _ in tasks],
+            timeout=timeout,
+            failures=failures
+        )
+    else:
+        objectives = [
+            guarded(calculate_objectives, floor_individual, configs[floor], timeout, failures, objectives=True)
+            for _, floor, floor_individual in tasks
+        ]
+    return [(index, floor_objectives) for (index, _, _), floor_objectives in zip(tasks, objectives)]
+
+
+def evaluate_batch(kind, batch, config_data, local_evaluator=None, timeout=None):
+    """
+    Evaluates one batch handed out by the dispatcher on this rank, returning its scores and the failure reasons.
+    """
+
+    failures = []
+    if kind == 'floors':
+        values = evaluate_floor_tasks(batch, floor_configs(config_data), local_evaluator, timeout, failures)
+    else:
+        values = evaluate_local(batch, config_data, local_evaluator, kind == 'objectives', timeout, failures)
+    return list(values), failures
+
+
+def evaluate_floors_parallel(
+    population,
+    config_data,
+    comm,
+    multi_objective=False,
+    stats=None,
+    local_evaluator=None,
+    evaluation_timeout=None,
+    dispatcher=None
+):
+    """
+    Evaluates a multi-floor population in parallel using MPI.
+
+    Every (individual, floor) pair is an independent task spread over the ranks; rank 0 then sums
+    the per-floor objectives of each individual and adds the cross-floor alignment term.
+    """
+
+    rank = comm.Get_rank()
+    size = comm.Get_size()
+    configs = floor_configs(config_data)
+
+    tasks = None
+    if rank == 0:
+        tasks = [
+            (index, floor, floor_individual)
+            for index, individual in enumerate(population)
+            for floor, floor_individual in enumerate(split_by_floor(individual, len(configs)))
+        ]
+
+    if rank == 0:
+        data = [tasks[chunk[0]:chunk[-1] + 1] if len(chunk) else [] for chunk in np.array_split(np.arange(len(tasks)), size)]
+    else:
+        data = None
+
+    local_tasks = comm.scatter(data, root=0)
+    start_time = time.perf_counter()
+    failures = []
+    local_results = evaluate_floor_tasks(
+        local_tasks, configs, local_evaluator, evaluation_timeout, failures, dispatcher
+    )
+
+    elapsed = time.perf_counter() - start_time
+    gathered = comm.gather((local_results, elapsed, failures), root=0)
+
+    if rank == 0:
+        objectives = np.zeros((len(population), len(OBJECTIVE_GROUPS)))
+        for results, _, _ in gathered:
+            for index, floor_objectives in results:
+                objectives[index] += floor_objectives
+
+        adjacency_index = list(OBJECTIVE_GROUPS).index('adjacency')
+        vertical_alignment = config_data.get("vertical_alignment", [])
+        for index, individual in enumerate(population):
+            objectives[index, adjacency_index] += compute_vertical_alignment_score(individual, vertical_alignment)
+            individual.fitness = float(objectives[index].sum())
+            if multi_objective:
+                individual.objectives = objectives[index]
+
+        all_failures = [reason for _, _, rank_failures in gathered for reason in rank_failures]
+        report_failures(all_failures)
+        if stats is not None:
+            if dispatcher is not None:
+                stats['rank_eval_seconds'] = dispatcher.rank_seconds
+            else:
+                stats['rank_eval_seconds'] = [rank_elapsed for _, rank_elapsed, _ in gathered]
+            stats['full_evaluations'] = len(population)
+            stats['failed_evaluations'] = len(all_failures)
+        return population
+    return None
+
+
+def update_surrogate(surrogate, evaluated, gathered_samples):
+    """
+    Reports surrogate accuracy, trains it on fully evaluated individuals and caps predicted fitness.
+    """
+
+    surrogate_scores = np.concatenate([samples[0] for samples in gathered_samples])
+    predicted = np.concatenate([samples[1] for samples in gathered_samples])
+    fully_evaluated = np.concatenate([samples[2] for samples in gathered_samples])
+    fitnesses = np.array([individual.fitness for individual in evaluated], dtype=float)
+
+    full_fitnesses = fitnesses[fully_evaluated]
+    if surrogate.is_trained():
+        surrogate.report = {
+            'mae': float(np.mean(np.abs(predicted[fully_evaluated] - full_fitnesses))),
+            'rank_correlation': rank_correlation(surrogate_scores[fully_evaluated], full_fitnesses),
+            'saved_fraction': float(1 - fully_evaluated.mean()),
+        }
+    else:
+        surrogate.report = {'mae': None, 'rank_correlation': None, 'saved_fraction': 0.0}
+
+    surrogate.update(surrogate_scores[fully_evaluated], full_fitnesses)
 
-    for individual in local_chunk:
-        individual.fitness = calculate_fitness(individual, config_data)
+    # Predicted individuals must never outrank fully evaluated ones
+    worst_full = full_fitnesses.min()
+    for individual, full in zip(evaluated, fully_evaluated):
+        if not full:
+            individual.fitness = min(individual.fitness, worst_full)
 
-    gathered_chunks = comm.gather(local_chunk, root=0)
+
+def breed_pair(
+    population,
+    config_data,
+    tournament_size,
+    crossover_prob,
+    mutation_prob,
+    selection_key,
+    rng=random,
+    clone=copy.copy,
+    repair_prob=0.0
+):
+    """
+    Selects two parents by tournament and produces two mutated children.
+
+    Each child is legalised with probability repair_prob, moving overlapping rooms to free space.
+    """
+
+    parent1 = tournament_selection(population, tournament_size, selection_key, rng)
+    parent2 = tournament_selection(population, tournament_size, selection_key, rng)
+
+    if rng.random() < crossover_prob:
+        child1, child2 = crossover(parent1, parent2, rng)
+    else:
+        child1 = clone(parent1)
+        child2 = clone(parent2)
+
+    mutate_building(child1, mutation_prob, config_data, rng)
+    mutate_building(child2, mutation_prob, config_data, rng)
+
+    if repair_prob > 0:
+        for child in (child1, child2):
+            if rng.random() < repair_prob:
+                repair_building(child, config_data)
+    return child1, child2
+
+
+def generate_next_population_reproducible(
+    global_population,
+    config_data,
+    population_size,
+    tournament_size,
+    crossover_prob,
+    mutation_prob,
+    elite_fraction,
+    comm,
+    selection_key,
+    seed,
+    generation,
+    repair_prob=0.0
+):
+    """
+    Generates the next population independently of the number of ranks.
+
+    Every rank sees the whole population and child pair i is bred from the Philox stream
+    keyed by (seed, generation, i), so the result only depends on the seed.
+    """
+
+    rank = comm.Get_rank()
+    size = comm.Get_size()
+
+    if rank == 0:
+        global_population.sort(key=selection_key, reverse=True)
+        num_elites = max(1, int(elite_fraction * population_size))
+        elites = [copy.deepcopy(ind) for ind in global_population[:num_elites]]
+    else:
+        elites = None
+
+    global_population = comm.bcast(global_population, root=0)
+    elites = comm.bcast(elites, root=0)
+
+    num_children = population_size - len(elites)
+    pair_indices = np.array_split(np.arange((num_children + 1) // 2), size)[rank]
+
+    next_population = []
+    for pair_index in pair_indices:
+        rng = stream_random(seed, STAGE_BREED, generation, int(pair_index))
+        # Children are deep copies so that no two pairs share mutable rooms, whichever rank breeds them
+        next_population.extend(breed_pair(
+            global_population, config_data, tournament_size, crossover_prob, mutation_prob,
+            selection_key, rng, copy.deepcopy, repair_prob
+        ))
+
+    gathered_population = comm.gather(next_population, root=0)
 
     if rank == 0:
-        return [individual for chunk in gathered_chunks for individual in chunk]
+        combined = [ind for sublist in gathered_population for ind in sublist]
+        return elites + combined[:num_children]
     return None
 
 
@@ -41,7 +382,9 @@ def generate_next_population_parallel(
     crossover_prob,
     mutation_prob,
     elite_fraction,
-    comm
+    comm,
+    selection_key=fitness_key,
+    repair_prob=0.0
 ):
     """
     Generates the next population using selection, crossover, and mutation in parallel.
@@ -51,7 +394,7 @@ def generate_next_population_parallel(
     size = comm.Get_size()
 
     if rank == 0:
-        global_population.sort(key=lambda ind: ind.fitness, reverse=True)
+        global_population.sort(key=selection_key, reverse=True)
         num_elites = max(1, int(elite_fraction * population_size))
         elites = [copy.deepcopy(ind) for ind in global_population[:num_elites]]
 
@@ -69,17 +412,10 @@ def generate_next_population_parallel(
 
     next_population = []
     while len(next_population) < population_size // size:
-        parent1 = tournament_selection(local_population, tournament_size)
-        parent2 = tournament_selection(local_population, tournament_size)
-
-        if random.random() < crossover_prob:
-            child1, child2 = crossover(parent1, parent2)
-        else:
-            child1 = copy.copy(parent1)
-            child2 = copy.copy(parent2)
-
-        mutate(child1, mutation_prob, config_data['building_constraints'])
-        mutate(child2, mutation_prob, config_data['building_constraints'])
+        child1, child2 = breed_pair(
+            local_population, config_data, tournament_size, crossover_prob, mutation_prob, selection_key,
+            repair_prob=repair_prob
+        )
 
         next_population.append(child1)
         if len(next_population) < population_size // size:
@@ -105,20 +441,75 @@ def run_evolution_parallel(
     early_stopping,
     comm,
     elite_fraction=0.02,
+    local_search_top_k=0,
+    local_search_steps=20,
+    surrogate_fraction=1.0,
+    repair_prob=0.0,
+    multi_objective=False,
+    local_workers=0,
+    evaluation_timeout=None,
+    rank_timeout=None,
+    telemetry=None,
+    seed=None,
     debug = False
 ):
     """
     Runs the full evolutionary loop in parallel.
+
+    In multi-objective mode survivors are chosen by NSGA-II non-dominated sorting and crowding distance,
+    and the returned hall of fame is the Pareto front found during the run, ordered by summed fitness.
+    With repair_prob > 0, offspring are legalised before evaluation to clear room overlaps.
+    With local_workers > 0 every rank evaluates its share on that many local worker processes (-1 splits each
+    node's cores between the ranks on it), so a single rank per node can use the whole node.
+    Failing evaluations, and those exceeding evaluation_timeout seconds, get a penalty fitness instead of
+    stopping the run. With rank_timeout set, the run is master-worker: rank 0 breeds alone and hands out
+    evaluation batches, reassigning the batch of any rank that has not answered within that many seconds,
+    while the other ranks only serve batches and never share a collective operation with rank 0.
+    Local search then runs on rank 0 alone.
+    If a telemetry emitter is given, rank 0 emits one metrics record per generation.
+    If a seed is given, all randomness comes from counter-based streams and the trajectory
+    is identical for any number of ranks.
     """
 
     rank = comm.Get_rank()
-    random.seed(42 + rank)
+    if seed is None:
+        random.seed(42 + rank)
 
     best_fitness = float('-inf')
     stagnation_counter = 0
     early_stopping_triggered = False
 
+    if is_multi_floor(config_data) and (surrogate_fraction < 1.0 or local_search_top_k > 0):
+        if rank == 0:
+            print("Surrogate pre-screening and local search are not supported for multi-floor layouts; disabling them.")
+        surrogate_fraction = 1.0
+        local_search_top_k = 0
+
+    if local_workers < 0:
+        local_workers = workers_per_rank(comm)
+    local_evaluator = LocalEvaluator(config_data, local_workers) if local_workers > 0 else None
+
+    dispatcher = None
+    if rank_timeout:
+        from mpi4py import MPI
+
+        def run_batch(kind, batch):
+            return evaluate_batch(kind, batch, config_data, local_evaluator, evaluation_timeout)
+
+        dispatcher = TaskDispatcher(comm, rank_timeout, run_batch)
+        if rank != 0:
+            dispatcher.serve()
+            if local_evaluator is not None:
+                local_evaluator.close()
+            return None, None
+        # Rank 0 runs everything but the dispatched evaluations by itself, so a stalled rank cannot hold it up
+        comm = MPI.COMM_SELF
+
     hall_of_fame = []
+    surrogate = SurrogateModel(surrogate_fraction) if surrogate_fraction < 1.0 and not multi_objective else None
+    selection_key = crowded_comparison_key if multi_objective else fitness_key
+    parents = None
+    pareto_archive = []
 
     population = comm.bcast(population, root=0)
 
@@ -126,9 +517,29 @@ def run_evolution_parallel(
         print("Starting parallel evolution...")
 
     for generation in range(num_generations):
-        population = evaluate_population_parallel(population, config_data, comm)
+        generation_start = time.perf_counter()
+        eval_stats = {}
+        population = evaluate_population_parallel(
+            population, config_data, comm, surrogate, multi_objective, eval_stats, local_evaluator,
+            evaluation_timeout, dispatcher
+        )
+        if surrogate is not None:
+            surrogate = comm.bcast(surrogate, root=0)
+
+        if local_search_top_k > 0:
+            population = refine_elites_parallel(
+                population, config_data, local_search_top_k, local_search_steps, comm, seed, generation
+            )
 
         if rank == 0:
+            if multi_objective:
+                if parents is not None:
+                    population = select_survivors(parents + population, population_size)
+                else:
+                    assign_pareto_ranks(population)
+                pareto_archive = update_pareto_archive(pareto_archive, population)
+                parents = copy.deepcopy(population)
+
             population.sort(key=lambda ind: ind.fitness, reverse=True)
             hall_of_fame.append(copy.deepcopy(population[0]))
             current_best = population[0].fitness
@@ -140,8 +551,28 @@ def run_evolution_parallel(
             else:
                 stagnation_counter += 1
 
+            if telemetry is not None:
+                fitnesses = np.array([ind.fitness for ind in population], dtype=float)
+                eval_seconds = max(eval_stats['rank_eval_seconds'])
+                telemetry.emit({
+                    'generation': generation + 1,
+                    'best_fitness': float(current_best),
+                    'avg_fitness': float(avg_fitness),
+                    'std_fitness': float(fitnesses.std()),
+                    'evaluations': eval_stats['full_evaluations'],
+                    'evaluations_per_second': eval_stats['full_evaluations'] / eval_seconds if eval_seconds > 0 else 0.0,
+                    'generation_seconds': time.perf_counter() - generation_start,
+                    'rank_eval_seconds': eval_stats['rank_eval_seconds'],
+                    'failed_evaluations': eval_stats['failed_evaluations'],
+                    'surrogate_saved_fraction': surrogate.report.get('saved_fraction') if surrogate else None,
+                })
+
             if debug:
                 print(f"Generation {generation + 1}: avg = {avg_fitness:.4f}, best = {current_best:.4f}")
+                if surrogate is not None and surrogate.report.get('mae') is not None:
+                    print(f"  surrogate: mae = {surrogate.report['mae']:.2f}, "
+                          f"rank corr = {surrogate.report['rank_correlation']:.3f}, "
+                          f"saved = {surrogate.report['saved_fraction']:.1%}")
 
             if stagnation_counter >= STAGNATION_NUM and early_stopping:
                 print(f"Early stopping at generation {generation + 1} due to stagnation.")
@@ -151,24 +582,53 @@ def run_evolution_parallel(
         if early_stopping and early_stopping_triggered:
             break
 
-        population = generate_next_population_parallel(
-            population,
-            config_data,
-            population_size,
-            tournament_size,
-            crossover_prob,
-            mutation_prob,
-            elite_fraction,
-            comm
-        )
+        if seed is None:
+            population = generate_next_population_parallel(
+                population,
+                config_data,
+                population_size,
+                tournament_size,
+                crossover_prob,
+                mutation_prob,
+                elite_fraction,
+                comm,
+                selection_key,
+                repair_prob
+            )
+        else:
+            population = generate_next_population_reproducible(
+                population,
+                config_data,
+                population_size,
+                tournament_size,
+                crossover_prob,
+                mutation_prob,
+                elite_fraction,
+                comm,
+                selection_key,
+                seed,
+                generation,
+                repair_prob
+            )
 
         population = comm.bcast(population, root=0)
 
-    population = evaluate_population_parallel(population, config_data, comm)
+    population = evaluate_population_parallel(
+        population, config_data, comm, multi_objective=multi_objective, local_evaluator=local_evaluator,
+        evaluation_timeout=evaluation_timeout, dispatcher=dispatcher
+    )
+    if dispatcher is not None:
+        dispatcher.stop()
+    if local_evaluator is not None:
+        local_evaluator.close()
     comm.Barrier()
 
     if rank == 0:
         print("Evolution finished.")
+        if multi_objective:
+            pareto_archive = update_pareto_archive(pareto_archive, population)
+            pareto_archive.sort(key=lambda ind: ind.fitness)
+            return population, pareto_archive
         hall_of_fame.append(copy.deepcopy(population[0]))
         return population, hall_of_fame
 
@@ -0,0 +1,187 @@
+import itertools
+import signal
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+
+import numpy as np
+
+from genetic.evaluator import OBJECTIVE_GROUPS
+
+FAILED_FITNESS = -1e9
+TASK_TAG = 910
+RESULT_TAG = 911
+POLL_INTERVAL = 0.001
+BATCHES_PER_RANK = 4
+
+_call_ids = itertools.count(1)
+
+
+class EvaluationTimeout(Exception):
+    pass
+
+
+@contextmanager
+def time_limit(seconds):
+    """
+    Raises EvaluationTimeout in the main thread if the block runs longer than the given number of seconds.
+
+    The alarm is delivered between Python bytecodes, so a single long GEOS call finishes before it fires.
+    """
+
+    if not seconds:
+        yield
+        return
+
+    def on_alarm(signum, frame):
+        raise EvaluationTimeout(f"evaluation exceeded {seconds} s")
+
+    previous = signal.signal(signal.SIGALRM, on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def failed_score(objectives=False):
+    if objectives:
+        return np.full(len(OBJECTIVE_GROUPS), FAILED_FITNESS)
+    return FAILED_FITNESS
+
+
+def guarded(evaluate, individual, config_data, timeout=None, failures=None, objectives=False):
+    """
+    Evaluates an individual, turning any exception or timeout into a penalty score and recording the reason.
+    """
+
+    try:
+        with time_limit(timeout):
+            return evaluate(individual, config_data)
+    except Exception as e:
+        if failures is not None:
+            failures.append(f"{type(e).__name__}: {e}")
+        return failed_score(objectives)
+
+
+def report_failures(failures):
+    """
+    Prints how often each distinct evaluation failure occurred.
+    """
+
+    for reason, count in Counter(failures).most_common():
+        print(f"Evaluation failed for {count} individual(s), penalised with fitness {FAILED_FITNESS:g}: {reason}")
+
+
+class TaskDispatcher:
+    """
+    Master-worker distribution of evaluation batches that keeps going when a worker rank stops responding.
+
+    The worker ranks call serve() once per run and do nothing but evaluate batches until rank 0 calls stop(),
+    so rank 0 never enters a collective operation with them. Rank 0 hands out small batches through map()
+    and evaluates batches itself while the workers are busy. A worker that does not return its batch within
+    rank_timeout seconds is marked unresponsive and its batch is given to another rank. A late result from
+    an unresponsive rank is discarded, and the rank is used again.
+
+    run_batch(kind, batch) evaluates one batch on the calling rank and returns its (values, failures).
+    """
+
+    def __init__(self, comm, rank_timeout, run_batch):
+        self.comm = comm
+        self.rank_timeout = rank_timeout
+        self.run_batch = run_batch
+        self.call_id = None
+        self.unresponsive = set()
+        self.rank_seconds = [0.0] * comm.Get_size()
+
+    def serve(self):
+        """
+        Evaluates the batches sent by rank 0 until it calls stop().
+        """
+
+        while True:
+            call_id, batch_id, kind, batch = self.comm.recv(source=0, tag=TASK_TAG)
+            if kind is None:
+                return
+            start_time = time.perf_counter()
+            results = self.run_batch(kind, batch)
+            self.comm.send((call_id, batch_id, results, time.perf_counter() - start_time), dest=0, tag=RESULT_TAG)
+
+    def stop(self):
+        for worker in range(1, self.comm.Get_size()):
+            self.comm.send((None, None, None, None), dest=worker, tag=TASK_TAG)
+
+    def map(self, kind, items):
+        """
+        Evaluates items in batches on all responsive ranks, returning their values in order and the failure reasons.
+
+        The seconds each rank spent evaluating are left in rank_seconds.
+        """
+
+        # Call ids are unique for the process, so a late result from an earlier call or run is never taken for this one
+        self.call_id = next(_call_ids)
+        size = self.comm.Get_size()
+        batch_size = max(1, -(-len(items) // (BATCHES_PER_RANK * size)))
+        batches = [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+
+        pending = deque(range(len(batches)))
+        results = {}
+        outstanding = {}
+        self.rank_seconds = [0.0] * size
+        idle = [worker for worker in range(1, size) if worker not in self.unresponsive]
+
+        while len(results) < len(batches):
+            while idle and pending:
+                worker = idle.pop()
+                batch_id = pending.popleft()
+                self.comm.send((self.call_id, batch_id, kind, batches[batch_id]), dest=worker, tag=TASK_TAG)
+                outstanding[worker] = (batch_id, time.monotonic() + self.rank_timeout)
+
+            received = self.collect(results, outstanding, idle)
+
+            now = time.monotonic()
+            for worker, (batch_id, deadline) in list(outstanding.items()):
+                if now > deadline:
+                    print(f"Rank {worker} did not respond within {self.rank_timeout} s; reassigning its batch.")
+                    del outstanding[worker]
+                    self.unresponsive.add(worker)
+                    if batch_id not in results:
+                        pending.appendleft(batch_id)
+
+            if pending:
+                batch_id = pending.popleft()
+                start_time = time.perf_counter()
+                results[batch_id] = self.run_batch(kind, batches[batch_id])
+                self.rank_seconds[0] += time.perf_counter() - start_time
+            elif not received:
+                time.sleep(POLL_INTERVAL)
+
+        values = [value for batch_id in range(len(batches)) for value in results[batch_id][0]]
+        failures = [reason for batch_id in range(len(batches)) for reason in results[batch_id][1]]
+        return values, failures
+
+    def collect(self, results, outstanding, idle):
+        """
+        Receives every result that has arrived, returning whether there were any.
+        """
+
+        from mpi4py import MPI
+
+        received = False
+        status = MPI.Status()
+        while self.comm.Iprobe(source=MPI.ANY_SOURCE, tag=RESULT_TAG, status=status):
+            worker = status.Get_source()
+            call_id, batch_id, batch_results, elapsed = self.comm.recv(source=worker, tag=RESULT_TAG)
+            received = True
+
+            if worker in self.unresponsive:
+                self.unresponsive.discard(worker)
+                idle.append(worker)
+            elif outstanding.pop(worker, None) is not None:
+                idle.append(worker)
+
+            if call_id == self.call_id and batch_id not in results:
+                results[batch_id] = batch_results
+                self.rank_seconds[worker] += elapsed
+        return received
@@ -0,0 +1,135 @@
+import math
+import random
+
+from .individual import Individual
+from .operators import initialize_population, mutate
+from .packing import legalize
+
+ALIGNED_REWARD = 100
+MISALIGNED_PENALTY = 10
+
+
+def is_multi_floor(config_data):
+    return "floors" in config_data
+
+
+def floor_configs(config_data):
+    """
+    Returns one single-floor configuration per floor, sharing the building-wide requirements.
+    """
+
+    if not is_multi_floor(config_data):
+        return [config_data]
+
+    shared = {
+        "corridor_width": config_data["corridor_width"],
+        "adjacency_requirements": config_data["adjacency_requirements"],
+        "separation_requirements": config_data["separation_requirements"],
+    }
+    return [{**shared, **floor} for floor in config_data["floors"]]
+
+
+def split_by_floor(individual, num_floors):
+    """
+    Splits an individual into one individual per floor, sharing the chromosome objects.
+    """
+
+    floors = [[] for _ in range(num_floors)]
+    for chromosome in individual.chromosomes:
+        floors[chromosome.floor].append(chromosome)
+    return [Individual(chromosomes=chromosomes) for chromosomes in floors]
+
+
+def compute_vertical_alignment_score(individual, vertical_alignment):
+    """
+    Rewards rooms of vertically aligned types (e.g. stairwells) that overlap the same type on the floor above,
+    and penalizes them by center distance otherwise.
+    """
+
+    score = 0.0
+    for room_type in vertical_alignment:
+        rooms_by_floor = {}
+        for room in individual.chromosomes:
+            if room.room_type == room_type:
+                rooms_by_floor.setdefault(room.floor, []).append(room)
+
+        for floor, rooms in rooms_by_floor.items():
+            rooms_above = rooms_by_floor.get(floor + 1)
+            if not rooms_above:
+                continue
+
+            for room in rooms:
+                best_ratio = 0.0
+                min_dist = math.inf
+                for above in rooms_above:
+                    overlap_w = min(room.x + room.width, above.x + above.width) - max(room.x, above.x)
+                    overlap_h = min(room.y + room.height, above.y + above.height) - max(room.y, above.y)
+                    if overlap_w > 0 and overlap_h > 0:
+                        ratio = overlap_w * overlap_h / min(room.get_area(), above.get_area())
+                        best_ratio = max(best_ratio, ratio)
+                    min_dist = min(min_dist, math.hypot(
+                        room.x + room.width / 2 - above.x - above.width / 2,
+                        room.y + room.height / 2 - above.y - above.height / 2
+                    ))
+
+                if best_ratio > 0:
+                    score += ALIGNED_REWARD * best_ratio
+                else:
+                    score -= MISALIGNED_PENALTY * min_dist
+    return score
+
+
+def initialize_building_population(config_data, population_size, seed=None, first_index=0):
+    """
+    Creates an initial population, placing every floor's rooms inside that floor's outline.
+
+    first_index numbers the seeded streams, so a population built in shards matches one built at once.
+    """
+
+    if not is_multi_floor(config_data):
+        return initialize_population(
+            config_data, population_size, config_data["building_constraints"], seed, first_index
+        )
+
+    population = [Individual() for _ in range(population_size)]
+    for floor, floor_config in enumerate(floor_configs(config_data)):
+        # Initialisation has no generation, so that stream coordinate tells the floors apart under one seed
+        floor_population = initialize_population(
+            floor_config, population_size, floor_config["building_constraints"], seed, first_index, floor
+        )
+        if len(floor_population) != population_size:
+            return []
+        for individual, floor_individual in zip(population, floor_population):
+            for chromosome in floor_individual.chromosomes:
+                chromosome.floor = floor
+            individual.chromosomes.extend(floor_individual.chromosomes)
+    return population
+
+
+def mutate_building(individual, mutation_prob, config_data, rng=random):
+    """
+    Mutates an individual, keeping every room inside the outline of its own floor.
+    """
+
+    if not is_multi_floor(config_data):
+        mutate(individual, mutation_prob, config_data['building_constraints'], rng)
+        return
+
+    configs = floor_configs(config_data)
+    for floor, floor_individual in enumerate(split_by_floor(individual, len(configs))):
+        mutate(floor_individual, mutation_prob, configs[floor]['building_constraints'], rng)
+
+
+def repair_building(individual, config_data):
+    """
+    Resolves overlapping rooms floor by floor, returning how many rooms were moved.
+    """
+
+    if not is_multi_floor(config_data):
+        return legalize(individual, config_data['building_constraints'])
+
+    configs = floor_configs(config_data)
+    return sum(
+        legalize(floor_individual, configs[floor]['building_constraints'])
+        for floor, floor_individual in enumerate(split_by_floor(individual, len(configs)))
+    )
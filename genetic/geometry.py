@@ -0,0 +1,115 @@
+import math
+from functools import cached_property, lru_cache
+
+import numpy as np
+import shapely
+from shapely.geometry import Polygon
+from shapely.ops import unary_union
+
+
+@lru_cache(maxsize=32)
+def building_polygon(outline):
+    """
+    Builds the prepared building polygon for an outline, shared by every evaluation against it.
+    """
+
+    polygon = Polygon(outline)
+    shapely.prepare(polygon)
+    return polygon
+
+
+def outline_polygon(building_outline):
+    return building_polygon(tuple((p['x'], p['y']) for p in building_outline))
+
+
+@lru_cache(maxsize=64)
+def building_grid(outline, mode="centre"):
+    """
+    Rasterises a building outline into unit cells, returning the grid origin and a mask of the cells inside it.
+
+    In 'centre' mode a cell is inside when its centre is; in 'cover' mode only cells the outline fully covers are.
+    The result depends only on the outline, so it is cached and shared by all evaluations.
+    """
+
+    if mode not in ("centre", "cover"):
+        raise ValueError(f"Unknown rasterisation mode '{mode}'")
+
+    polygon = building_polygon(outline)
+    min_x, min_y, max_x, max_y = polygon.bounds
+    origin_x, origin_y = math.floor(min_x), math.floor(min_y)
+    cols, rows = math.ceil(max_x) - origin_x, math.ceil(max_y) - origin_y
+
+    xs, ys = np.meshgrid(np.arange(cols) + origin_x, np.arange(rows) + origin_y)
+    if mode == "centre":
+        inside = shapely.contains_xy(polygon, xs + 0.5, ys + 0.5)
+    else:
+        inside = shapely.covers(polygon, shapely.box(xs, ys, xs + 1, ys + 1))
+    return origin_x, origin_y, inside
+
+
+class LayoutGeometry:
+    """
+    Per-individual geometry shared by all score terms.
+
+    Every derived shape is computed lazily on first access and cached, so terms that need the same
+    geometry (e.g. the corridor polygons) trigger the Shapely operation only once per evaluation.
+    New score terms should take a LayoutGeometry and read what they need from it.
+    """
+
+    def __init__(self, room_boxes, building_poly):
+        self.room_boxes = room_boxes
+        self.building_poly = building_poly
+
+    @cached_property
+    def box_array(self):
+        return np.array(list(self.room_boxes.values()), dtype=object)
+
+    @cached_property
+    def room_union(self):
+        return unary_union(list(self.room_boxes.values()))
+
+    @cached_property
+    def corridor_area(self):
+        return self.building_poly.difference(self.room_union)
+
+    @cached_property
+    def corridor_polygons(self):
+        corridor_area = self.corridor_area
+        if corridor_area.is_empty:
+            return []
+        return list(corridor_area.geoms) if corridor_area.geom_type == 'MultiPolygon' else [corridor_area]
+
+    @cached_property
+    def room_corridor_map(self):
+        """
+        Maps each room to the index of the first corridor polygon its walls touch; rooms without a corridor are absent.
+        """
+
+        room_corridor_map = {}
+        for room, room_box in self.room_boxes.items():
+            for i, corridor in enumerate(self.corridor_polygons):
+                if room_box.exterior.intersects(corridor):
+                    room_corridor_map[room] = i
+                    break
+        return room_corridor_map
+
+    @cached_property
+    def outside_areas(self):
+        """
+        Maps each room to the area lying outside the building, or None if the building covers it.
+        """
+
+        boxes = self.box_array
+        covered = shapely.covers(self.building_poly, boxes)
+        areas = np.full(len(boxes), None, dtype=object)
+        areas[~covered] = shapely.area(shapely.difference(boxes[~covered], self.building_poly)).tolist()
+        return dict(zip(self.room_boxes, areas.tolist()))
+
+    @cached_property
+    def exterior_contact_lengths(self):
+        """
+        Maps each room to the length of its contact with the building's external walls.
+        """
+
+        lengths = shapely.length(shapely.intersection(self.box_array, self.building_poly.exterior))
+        return dict(zip(self.room_boxes, lengths.tolist()))
@@ -0,0 +1,172 @@
+import multiprocessing
+import os
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from genetic.chromosome import Chromosome
+from genetic.individual import Individual
+from genetic.evaluator import calculate_fitness, calculate_objectives, OBJECTIVE_GROUPS
+from genetic.floors import floor_configs
+from genetic.faults import guarded
+
+ROOM_COLUMNS = 6  # type index, x, y, width, height, floor
+
+_worker_state = {}
+
+
+def workers_per_rank(comm):
+    """
+    Splits the cores of each node evenly between the MPI ranks running on it.
+    """
+
+    from mpi4py import MPI
+
+    node_comm = comm.Split_type(MPI.COMM_TYPE_SHARED)
+    ranks_on_node = node_comm.Get_size()
+    node_comm.Free()
+    return max(1, (os.cpu_count() or 1) // ranks_on_node)
+
+
+def pack_rooms(individuals):
+    """
+    Flattens the rooms of a list of individuals into one array, returning it with the room type names
+    and the offsets where each individual's rooms start.
+    """
+
+    type_names = []
+    type_index = {}
+    rows = []
+    offsets = [0]
+    for individual in individuals:
+        for room in individual.chromosomes:
+            if room.room_type not in type_index:
+                type_index[room.room_type] = len(type_names)
+                type_names.append(room.room_type)
+            rows.append((type_index[room.room_type], room.x, room.y, room.width, room.height, room.floor))
+        offsets.append(len(rows))
+
+    dtype = np.int64 if all(isinstance(v, int) for row in rows for v in row) else np.float64
+    return np.array(rows, dtype=dtype).reshape(-1, ROOM_COLUMNS), type_names, offsets
+
+
+def unpack_individual(rooms, type_names):
+    return Individual(chromosomes=[
+        Chromosome(type_names[int(t)], x, y, width, height, int(floor))
+        for t, x, y, width, height, floor in rooms.tolist()
+    ])
+
+
+def init_worker(config_data):
+    _worker_state['config_data'] = config_data
+    _worker_state['floor_configs'] = floor_configs(config_data)
+
+
+def attach(name):
+    """
+    Attaches to a shared memory block owned by the parent process.
+
+    The workers share the parent's resource tracker, which already holds the block, so attaching
+    registers nothing new and the parent's unlink is the only one.
+    """
+
+    return shared_memory.SharedMemory(name=name)
+
+
+def evaluate_slice(task):
+    """
+    Evaluates a contiguous range of individuals read from shared memory, writing their scores back in place
+    and returning the reasons of any failed evaluations.
+    """
+
+    (rooms_name, rooms_shape, rooms_dtype, results_name, results_shape,
+     type_names, offsets, floors, timeout, start, stop) = task
+    objectives = len(results_shape) == 2
+    evaluate = calculate_objectives if objectives else calculate_fitness
+    failures = []
+
+    rooms_block = attach(rooms_name)
+    results_block = attach(results_name)
+    try:
+        rooms = np.ndarray(rooms_shape, dtype=rooms_dtype, buffer=rooms_block.buf)
+        results = np.ndarray(results_shape, dtype=np.float64, buffer=results_block.buf)
+
+        for i in range(start, stop):
+            individual = unpack_individual(rooms[offsets[i]:offsets[i + 1]], type_names)
+            if floors is None:
+                config_data = _worker_state['config_data']
+            else:
+                config_data = _worker_state['floor_configs'][floors[i]]
+
+            results[i] = guarded(evaluate, individual, config_data, timeout, failures, objectives)
+        del rooms, results
+    finally:
+        rooms_block.close()
+        results_block.close()
+    return failures
+
+
+class LocalEvaluator:
+    """
+    Evaluates a rank's share of the population on a pool of local worker processes.
+
+    The workers are started once per run and receive the configuration when they start instead of per task.
+    Each call copies the rooms into a shared memory block that the workers read in place and write their scores
+    into, so the individuals themselves are never pickled between processes.
+
+    The rank creating the pool has already initialised MPI, and on rank 0 also Qt and the telemetry and run store
+    writer threads, none of which survive a fork. The workers are therefore forked from a fork server, which
+    imports the main module with MPI4PY_RC_INITIALIZE disabled, so the main module must not call MPI at import
+    time.
+    """
+
+    def __init__(self, config_data, workers):
+        self.workers = workers
+        context = multiprocessing.get_context("forkserver")
+        # The fork server is started with the first pool and keeps the environment it was started with
+        previous = os.environ.get("MPI4PY_RC_INITIALIZE")
+        os.environ["MPI4PY_RC_INITIALIZE"] = "false"
+        try:
+            self.pool = context.Pool(processes=workers, initializer=init_worker, initargs=(config_data,))
+        finally:
+            if previous is None:
+                del os.environ["MPI4PY_RC_INITIALIZE"]
+            else:
+                os.environ["MPI4PY_RC_INITIALIZE"] = previous
+
+    def evaluate(self, individuals, objectives=False, floors=None, timeout=None, failures=None):
+        """
+        Returns the fitness of each individual, or its objective vector as rows of an array if objectives is set.
+
+        If floors is given, individual i is scored against the configuration of floor floors[i].
+        Failed evaluations get a penalty score and their reasons are appended to failures.
+        """
+
+        results_shape = (len(individuals), len(OBJECTIVE_GROUPS)) if objectives else (len(individuals),)
+        if len(individuals) == 0:
+            return np.zeros(results_shape)
+
+        rooms, type_names, offsets = pack_rooms(individuals)
+        rooms_block = shared_memory.SharedMemory(create=True, size=max(1, rooms.nbytes))
+        results_block = shared_memory.SharedMemory(create=True, size=int(np.prod(results_shape)) * 8)
+        try:
+            np.ndarray(rooms.shape, dtype=rooms.dtype, buffer=rooms_block.buf)[:] = rooms
+            bounds = np.linspace(0, len(individuals), min(self.workers, len(individuals)) + 1).astype(int)
+            tasks = [
+                (rooms_block.name, rooms.shape, rooms.dtype.str, results_block.name, results_shape,
+                 type_names, offsets, floors, timeout, int(start), int(stop))
+                for start, stop in zip(bounds[:-1], bounds[1:])
+            ]
+            slice_failures = self.pool.map(evaluate_slice, tasks)
+            if failures is not None:
+                failures.extend(reason for reasons in slice_failures for reason in reasons)
+            return np.ndarray(results_shape, dtype=np.float64, buffer=results_block.buf).copy()
+        finally:
+            rooms_block.close()
+            rooms_block.unlink()
+            results_block.close()
+            results_block.unlink()
+
+    def close(self):
+        self.pool.close()
+        self.pool.join()
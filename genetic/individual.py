@@ -3,9 +3,12 @@ class Individual:
     Represents a single building layout
     """
 
-    def __init__(self, chromosomes=None, fitness=None):
+    def __init__(self, chromosomes=None, fitness=None, objectives=None):
         self.chromosomes = chromosomes if chromosomes is not None else []
         self.fitness = fitness
+        self.objectives = objectives
+        self.pareto_rank = None
+        self.crowding_distance = None
     
     def __repr__(self):
         return (f"Individual(num_rooms={len(self.chromosomes)}, "
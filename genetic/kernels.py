@@ -0,0 +1,126 @@
+import numpy as np
+
+BACKENDS = ("shapely", "numpy", "numba")
+
+_backend = None
+
+
+class NumpyKernels:
+    """
+    Pairwise score terms computed directly from integer rectangle arrays with NumPy
+    """
+
+    name = "numpy"
+
+    @staticmethod
+    def shared_wall_score(rects, corridor_width):
+        i, j = np.triu_indices(len(rects), k=1)
+        x1, y1 = rects[:, 0], rects[:, 1]
+        x2, y2 = x1 + rects[:, 2], y1 + rects[:, 3]
+
+        gap_x = np.maximum(0, np.maximum(x1[i], x1[j]) - np.minimum(x2[i], x2[j]))
+        gap_y = np.maximum(0, np.maximum(y1[i], y1[j]) - np.minimum(y2[i], y2[j]))
+        dist = np.hypot(gap_x, gap_y)
+
+        # Boundaries share length only along collinear edges
+        overlap_x = np.maximum(0, np.minimum(x2[i], x2[j]) - np.maximum(x1[i], x1[j]))
+        overlap_y = np.maximum(0, np.minimum(y2[i], y2[j]) - np.maximum(y1[i], y1[j]))
+        vertical_matches = sum((a[i] == b[j]).astype(int) for a in (x1, x2) for b in (x1, x2))
+        horizontal_matches = sum((a[i] == b[j]).astype(int) for a in (y1, y2) for b in (y1, y2))
+        shared = vertical_matches * overlap_y + horizontal_matches * overlap_x
+
+        perimeter = 2 * (rects[:, 2] + rects[:, 3])
+        touching = dist < 1e-3
+        near = ~touching & (dist <= corridor_width)
+
+        score = 2.0 * shared[touching].sum()
+        score += 2.0 * np.minimum(perimeter[i], perimeter[j])[near].sum()
+        return float(score)
+
+    @staticmethod
+    def adjacency_score(centers, type_ids, requirements):
+        score = 0.0
+        for type1, type2 in requirements:
+            centers1 = centers[type_ids == type1]
+            centers2 = centers[type_ids == type2]
+            if len(centers1) and len(centers2):
+                diff = centers1[:, None, :] - centers2[None, :, :]
+                min_dist = np.sqrt((diff ** 2).sum(axis=2)).min()
+                if min_dist <= 1:
+                    score += 30
+                elif min_dist <= 3:
+                    score += 10
+                else:
+                    score -= (min_dist - 3) * 5
+        return score
+
+
+def set_backend(name):
+    """
+    Selects the implementation of the pairwise score terms; 'shapely' keeps the original geometry code.
+
+    The Numba backend is imported only when selected and falls back to NumPy if Numba is not installed.
+    """
+
+    global _backend
+
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown evaluator backend '{name}'")
+
+    if name == "shapely":
+        _backend = None
+    elif name == "numpy":
+        _backend = NumpyKernels
+    else:
+        try:
+            from genetic.kernels_numba import NumbaKernels
+            _backend = NumbaKernels
+        except ImportError:
+            print("Numba is not installed, falling back to the NumPy evaluator backend")
+            _backend = NumpyKernels
+
+
+def get_backend():
+    return _backend
+
+
+def room_arrays(chromosomes):
+    """
+    Converts rooms to an integer (x, y, width, height) array and an array of room centers.
+    """
+
+    rects = np.array([[room.x, room.y, room.width, room.height] for room in chromosomes], dtype=np.int64)
+    rects = rects.reshape(-1, 4)
+    centers = rects[:, :2] + rects[:, 2:] / 2
+    return rects, centers
+
+
+def encode_requirements(chromosomes, requirements):
+    """
+    Maps room types to integer ids, returning the per-room ids and the requirement pairs as id pairs.
+    """
+
+    type_index = {}
+    for room in chromosomes:
+        type_index.setdefault(room.room_type, len(type_index))
+    type_ids = np.array([type_index[room.room_type] for room in chromosomes], dtype=np.int64)
+
+    missing = len(type_index)
+    pairs = np.array(
+        [[type_index.get(type1, missing), type_index.get(type2, missing)] for type1, type2 in requirements],
+        dtype=np.int64
+    ).reshape(-1, 2)
+    return type_ids, pairs
+
+
+def pairwise_terms(backend, chromosomes, adjacency_requirements, corridor_width):
+    """
+    Computes the shared wall and adjacency terms with a compiled or vectorised backend.
+    """
+
+    rects, centers = room_arrays(chromosomes)
+    type_ids, pairs = encode_requirements(chromosomes, adjacency_requirements)
+    return (
+        backend.shared_wall_score(rects, float(corridor_width)),
+        backend.adjacency_score(centers, type_ids, pairs),
+    )
@@ -0,0 +1,75 @@
+import math
+
+from numba import njit
+
+
+@njit(cache=True)
+def shared_wall_kernel(rects, corridor_width):
+    score = 0.0
+    n = rects.shape[0]
+    for i in range(n):
+        ax1, ay1 = rects[i, 0], rects[i, 1]
+        ax2, ay2 = ax1 + rects[i, 2], ay1 + rects[i, 3]
+        for j in range(i + 1, n):
+            bx1, by1 = rects[j, 0], rects[j, 1]
+            bx2, by2 = bx1 + rects[j, 2], by1 + rects[j, 3]
+
+            gap_x = max(0, max(ax1, bx1) - min(ax2, bx2))
+            gap_y = max(0, max(ay1, by1) - min(ay2, by2))
+            dist = math.sqrt(gap_x * gap_x + gap_y * gap_y)
+
+            if dist < 1e-3:
+                overlap_x = max(0, min(ax2, bx2) - max(ax1, bx1))
+                overlap_y = max(0, min(ay2, by2) - max(ay1, by1))
+                vertical = (ax1 == bx1) + (ax1 == bx2) + (ax2 == bx1) + (ax2 == bx2)
+                horizontal = (ay1 == by1) + (ay1 == by2) + (ay2 == by1) + (ay2 == by2)
+                score += 2.0 * (vertical * overlap_y + horizontal * overlap_x)
+            elif dist <= corridor_width:
+                perimeter_a = 2 * (rects[i, 2] + rects[i, 3])
+                perimeter_b = 2 * (rects[j, 2] + rects[j, 3])
+                score += 2.0 * min(perimeter_a, perimeter_b)
+    return score
+
+
+@njit(cache=True)
+def adjacency_kernel(centers, type_ids, requirements):
+    score = 0.0
+    n = centers.shape[0]
+    for k in range(requirements.shape[0]):
+        type1, type2 = requirements[k, 0], requirements[k, 1]
+        min_dist = math.inf
+        for i in range(n):
+            if type_ids[i] != type1:
+                continue
+            for j in range(n):
+                if type_ids[j] != type2:
+                    continue
+                dx = centers[i, 0] - centers[j, 0]
+                dy = centers[i, 1] - centers[j, 1]
+                min_dist = min(min_dist, math.sqrt(dx * dx + dy * dy))
+
+        if min_dist == math.inf:
+            continue
+        if min_dist <= 1:
+            score += 30
+        elif min_dist <= 3:
+            score += 10
+        else:
+            score -= (min_dist - 3) * 5
+    return score
+
+
+class NumbaKernels:
+    """
+    Pairwise score terms compiled with Numba
+    """
+
+    name = "numba"
+
+    @staticmethod
+    def shared_wall_score(rects, corridor_width):
+        return shared_wall_kernel(rects, corridor_width)
+
+    @staticmethod
+    def adjacency_score(centers, type_ids, requirements):
+        return adjacency_kernel(centers, type_ids, requirements)
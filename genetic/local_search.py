@@ -0,0 +1,147 @@
+import copy
+import random
+
+import numpy as np
+
+from genetic.evaluator import (
+    calculate_fitness,
+    calculate_objectives,
+    get_room_box,
+    penalize_overlaps,
+    penalize_area,
+    penalize_boundary,
+    compute_wall_contact_score,
+    penalize_aspect_ratio,
+    compute_shared_wall_score,
+)
+from genetic.geometry import LayoutGeometry, outline_polygon
+from genetic.rng import stream_random, STAGE_LOCAL_SEARCH
+
+NEIGHBOUR_MOVES = [
+    ('x', -1), ('x', 1),
+    ('y', -1), ('y', 1),
+    ('width', -1), ('width', 1),
+    ('height', -1), ('height', 1),
+]
+
+
+def room_local_score(room, room_boxes, building_poly, min_area, corridor_width):
+    """
+    Sums the score terms that depend only on a single room and its pairings with the other rooms.
+    """
+
+    room_pairs = [(room, other) for other in room_boxes if other is not room]
+    room_geometry = LayoutGeometry({room: room_boxes[room]}, building_poly)
+
+    return (
+        penalize_overlaps(room_pairs, room_boxes)
+        + penalize_area([room], min_area)
+        + penalize_boundary(room_geometry)
+        + compute_wall_contact_score(room_geometry)
+        + penalize_aspect_ratio([room])
+        + compute_shared_wall_score(room_pairs, room_boxes, corridor_width)
+    )
+
+
+def hill_climb(individual, config_data, max_evaluations, rng=random):
+    """
+    Greedily applies unit moves to rooms, keeping those that improve the full fitness.
+
+    Each candidate move is first screened by the change of the room's local score terms,
+    so only moves that look promising are sent to the full evaluator.
+    """
+
+    min_area = {r['type']: r.get('min_area', 0) for r in config_data.get('rooms', [])}
+    building_poly = outline_polygon(config_data.get('building_constraints', []))
+    corridor_width = config_data.get("corridor_width", 1.0)
+
+    if individual.fitness is None:
+        individual.fitness = calculate_fitness(individual, config_data)
+
+    room_boxes = {room: get_room_box(room) for room in individual.chromosomes}
+
+    evaluations = 0
+    changed = False
+    improved = True
+    while improved and evaluations < max_evaluations:
+        improved = False
+        rooms = list(individual.chromosomes)
+        rng.shuffle(rooms)
+
+        for room in rooms:
+            original_box = room_boxes[room]
+            local_before = room_local_score(room, room_boxes, building_poly, min_area, corridor_width)
+
+            for attribute, change in NEIGHBOUR_MOVES:
+                original = getattr(room, attribute)
+                new_value = original + change
+                if attribute in ('width', 'height') and new_value < 1:
+                    continue
+
+                setattr(room, attribute, new_value)
+                room_boxes[room] = get_room_box(room)
+                if not building_poly.contains(room_boxes[room]):
+                    setattr(room, attribute, original)
+                    room_boxes[room] = original_box
+                    continue
+
+                local_after = room_local_score(room, room_boxes, building_poly, min_area, corridor_width)
+                if local_after <= local_before:
+                    setattr(room, attribute, original)
+                    room_boxes[room] = original_box
+                    continue
+
+                fitness = calculate_fitness(individual, config_data)
+                evaluations += 1
+                if fitness > individual.fitness:
+                    individual.fitness = fitness
+                    improved = changed = True
+                    break
+
+                setattr(room, attribute, original)
+                room_boxes[room] = original_box
+                if evaluations >= max_evaluations:
+                    break
+
+            if improved or evaluations >= max_evaluations:
+                break
+
+    if changed and individual.objectives is not None:
+        individual.objectives = calculate_objectives(individual, config_data)
+
+    return individual
+
+
+def refine_elites_parallel(population, config_data, top_k, max_evaluations, comm, seed=None, generation=0):
+    """
+    Applies hill climbing to the top-k individuals of an evaluated population in parallel using MPI.
+    """
+
+    rank = comm.Get_rank()
+    size = comm.Get_size()
+
+    if rank == 0:
+        population.sort(key=lambda ind: ind.fitness, reverse=True)
+        top_k = min(top_k, len(population))
+        data = np.array_split(np.arange(top_k), size)
+        data = [[(int(i), population[i]) for i in indices] for indices in data]
+    else:
+        data = None
+
+    local_chunk = comm.scatter(data, root=0)
+
+    refined_chunk = []
+    for index, individual in local_chunk:
+        rng = random if seed is None else stream_random(seed, STAGE_LOCAL_SEARCH, generation, index)
+        try:
+            refined_chunk.append(hill_climb(copy.deepcopy(individual), config_data, max_evaluations, rng))
+        except Exception as e:
+            print(f"Local search failed, keeping the unrefined individual: {type(e).__name__}: {e}")
+            refined_chunk.append(individual)
+
+    gathered_chunks = comm.gather(refined_chunk, root=0)
+
+    if rank == 0:
+        refined = [individual for chunk in gathered_chunks for individual in chunk]
+        return refined + population[top_k:]
+    return None
@@ -1,27 +1,31 @@
 import copy
 import math
-from matplotlib.path import Path
 from shapely.geometry import Polygon, box
 import random
 from .chromosome import Chromosome
+from .geometry import outline_polygon
 from .individual import Individual
+from .rng import stream_random, STAGE_INIT
 
 
-def initialize_population(config_data, population_size, building_outline):
+def initialize_population(config_data, population_size, building_outline, seed=None, first_index=0, floor=0):
     """
     Creates an initial population of individuals constrained by the building outline
+
+    If a seed is given, each individual is drawn from its own counter-based stream, numbered from first_index,
+    among the initialisation streams of the given floor
     """
 
     population = []
     room_definitions = config_data.get('rooms', [])
-    outline_points = [(p['x'], p['y']) for p in building_outline]
-    building_path = Path(outline_points)
+    building_polygon = outline_polygon(building_outline)
 
     if not room_definitions:
         print("No room definitions found in config data")
         return population
 
-    for _ in range(population_size):
+    for index in range(population_size):
+        rng = random if seed is None else stream_random(seed, STAGE_INIT, floor, first_index + index)
         current_individual_chromosomes = []
 
         for room in room_definitions:
@@ -33,7 +37,7 @@ def initialize_population(config_data, population_size, building_outline):
                 max_attempts = 100
                 for attempt in range(max_attempts):
                     initial_width = max(1, int(math.sqrt(min_area)) + 3)
-                    width = random.randint(1, initial_width)
+                    width = rng.randint(1, initial_width)
                     height = max(1, math.ceil(min_area / width))
 
                     min_x = min(p['x'] for p in building_outline)
@@ -44,17 +48,10 @@ def initialize_population(config_data, population_size, building_outline):
                     if max_x <= min_x or max_y <= min_y:
                         continue
 
-                    x = random.randint(min_x, max_x)
-                    y = random.randint(min_y, max_y)
-
-                    rect_points = [
-                        (x, y),
-                        (x + width, y),
-                        (x, y + height),
-                        (x + width, y + height),
-                    ]
+                    x = rng.randint(min_x, max_x)
+                    y = rng.randint(min_y, max_y)
 
-                    if all(building_path.contains_point(p) for p in rect_points):
+                    if building_polygon.contains(box(x, y, x + width, y + height)):
                         new_chromosome = Chromosome(room_type, x, y, width, height)
                         current_individual_chromosomes.append(new_chromosome)
                         break
@@ -67,20 +64,24 @@ def initialize_population(config_data, population_size, building_outline):
     return population
 
 
-def tournament_selection(population, tournament_size):
+def fitness_key(individual):
+    return individual.fitness
+
+
+def tournament_selection(population, tournament_size, key=fitness_key, rng=random):
     """
     Select a parent from population using tournament selection
     """
 
     if len(population) < tournament_size:
-        return max(population,key = lambda individual : individual.fitness)
+        return max(population,key = key)
     
 
-    tournament = random.sample(population,tournament_size)
-    return max(tournament,key = lambda individual : individual.fitness)
+    tournament = rng.sample(population,tournament_size)
+    return max(tournament,key = key)
 
 
-def crossover(parent1, parent2):
+def crossover(parent1, parent2, rng=random):
     """
     Performs single-point crossover on two parents to create two children
     """
@@ -88,7 +89,7 @@ def crossover(parent1, parent2):
     if len(parent1.chromosomes) < 2:
         return Individual(chromosomes=parent1.chromosomes),Individual(chromosomes=parent2.chromosomes)
     
-    crossover_point = random.randint(1, len(parent1.chromosomes) - 1)
+    crossover_point = rng.randint(1, len(parent1.chromosomes) - 1)
     
     p1_chromosomes = list(parent1.chromosomes)
     p2_chromosomes = list(parent2.chromosomes)
@@ -102,7 +103,7 @@ def crossover(parent1, parent2):
     return child1,child2
 
 
-def mutate(individual, mutation_prob, building_outline):
+def mutate(individual, mutation_prob, building_outline, rng=random):
     """
     Performs mutation on an individual, ensuring chromosomes stay within the building shape.
     """
@@ -110,15 +111,15 @@ def mutate(individual, mutation_prob, building_outline):
     building_polygon = Polygon([(p['x'], p['y']) for p in building_outline])
 
     for chromosome in individual.chromosomes:
-        if random.random() < mutation_prob:
-            mutation_type = random.choice(['position', 'size'])
+        if rng.random() < mutation_prob:
+            mutation_type = rng.choice(['position', 'size'])
 
             original_x, original_y = chromosome.x, chromosome.y
             original_width, original_height = chromosome.width, chromosome.height
 
             if mutation_type == 'position':
-                axis = random.choice(['x', 'y'])
-                change = random.choice([-1, 1])
+                axis = rng.choice(['x', 'y'])
+                change = rng.choice([-1, 1])
 
                 if axis == 'x':
                     chromosome.x += change
@@ -126,8 +127,8 @@ def mutate(individual, mutation_prob, building_outline):
                     chromosome.y += change
 
             elif mutation_type == 'size':
-                dim_to_change = random.choice(['width', 'height'])
-                change = random.choice([-2, 2])
+                dim_to_change = rng.choice(['width', 'height'])
+                change = rng.choice([-2, 2])
 
                 if dim_to_change == 'width':
                     chromosome.width = max(1, chromosome.width + change)
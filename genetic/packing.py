@@ -0,0 +1,77 @@
+import numpy as np
+
+from genetic.geometry import building_grid
+
+
+def free_positions(blocked, width, height):
+    """
+    Returns a mask of the positions where a width x height rectangle covers no blocked cell.
+
+    Uses a summed-area table, so every position is tested in constant time.
+    """
+
+    rows, cols = blocked.shape
+    if width > cols or height > rows:
+        return None
+
+    integral = np.zeros((rows + 1, cols + 1), dtype=np.int64)
+    integral[1:, 1:] = blocked.cumsum(axis=0).cumsum(axis=1)
+    window = (integral[height:, width:] - integral[:-height, width:]
+              - integral[height:, :-width] + integral[:-height, :-width])
+    return window == 0
+
+
+def nearest_free_position(blocked, width, height, x, y):
+    """
+    Finds the free position for a width x height rectangle closest to (x, y) in Manhattan distance, or None.
+    """
+
+    free = free_positions(blocked, width, height)
+    if free is None or not free.any():
+        return None
+
+    ys, xs = np.nonzero(free)
+    nearest = np.argmin(np.abs(xs - x) + np.abs(ys - y))
+    return int(xs[nearest]), int(ys[nearest])
+
+
+def legalize(individual, building_outline):
+    """
+    Moves overlapping or out-of-bounds rooms to the nearest free spot inside the building, returning how many moved.
+
+    Rooms are visited largest first; a room that already fits stays where it is and claims its cells,
+    while the others are relocated (rotated if needed) without changing their size. Rooms that fit
+    nowhere are left untouched. Only integer layouts are repaired.
+    """
+
+    rooms = individual.chromosomes
+    if not all(isinstance(v, int) for room in rooms for v in (room.x, room.y, room.width, room.height)):
+        return 0
+
+    outline = tuple((p['x'], p['y']) for p in building_outline)
+    origin_x, origin_y, inside = building_grid(outline, "cover")
+    rows, cols = inside.shape
+    blocked = ~inside
+
+    pending = []
+    for room in sorted(rooms, key=lambda room: room.get_area(), reverse=True):
+        x0, y0 = room.x - origin_x, room.y - origin_y
+        x1, y1 = x0 + room.width, y0 + room.height
+        if 0 <= x0 and 0 <= y0 and x1 <= cols and y1 <= rows and not blocked[y0:y1, x0:x1].any():
+            blocked[y0:y1, x0:x1] = True
+        else:
+            pending.append(room)
+
+    moved = 0
+    for room in pending:
+        x, y = room.x - origin_x, room.y - origin_y
+        for width, height in ((room.width, room.height), (room.height, room.width)):
+            position = nearest_free_position(blocked, width, height, x, y)
+            if position is not None:
+                px, py = position
+                blocked[py:py + height, px:px + width] = True
+                room.x, room.y = px + origin_x, py + origin_y
+                room.width, room.height = width, height
+                moved += 1
+                break
+    return moved
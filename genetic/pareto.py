@@ -0,0 +1,106 @@
+import copy
+
+import numpy as np
+
+
+def dominance_matrix(objectives):
+    """
+    Returns a boolean matrix where entry (i, j) is True if individual i dominates individual j (maximisation).
+    """
+
+    n = len(objectives)
+    all_geq = np.ones((n, n), dtype=bool)
+    any_greater = np.zeros((n, n), dtype=bool)
+    for k in range(objectives.shape[1]):
+        column = objectives[:, k]
+        all_geq &= column[:, None] >= column[None, :]
+        any_greater |= column[:, None] > column[None, :]
+    return all_geq & any_greater
+
+
+def fast_non_dominated_sort(objectives):
+    """
+    Splits individuals into Pareto fronts, returning a list of index arrays from best to worst front.
+    """
+
+    objectives = np.asarray(objectives, dtype=float)
+    dominates = dominance_matrix(objectives)
+    domination_count = dominates.sum(axis=0)
+    remaining = np.ones(len(objectives), dtype=bool)
+
+    fronts = []
+    while remaining.any():
+        front = np.flatnonzero(remaining & (domination_count == 0))
+        fronts.append(front)
+        remaining[front] = False
+        domination_count = domination_count - dominates[front].sum(axis=0)
+    return fronts
+
+
+def crowding_distance(objectives):
+    """
+    Computes the NSGA-II crowding distance of individuals within a single front.
+    """
+
+    objectives = np.asarray(objectives, dtype=float)
+    n, m = objectives.shape
+    distance = np.zeros(n)
+    if n <= 2:
+        distance[:] = np.inf
+        return distance
+
+    for k in range(m):
+        order = np.argsort(objectives[:, k], kind='stable')
+        values = objectives[order, k]
+        distance[order[0]] = distance[order[-1]] = np.inf
+        value_range = values[-1] - values[0]
+        if value_range > 0:
+            distance[order[1:-1]] += (values[2:] - values[:-2]) / value_range
+    return distance
+
+
+def assign_pareto_ranks(population):
+    """
+    Stores the Pareto front index and crowding distance on each individual and returns the fronts.
+    """
+
+    objectives = np.array([individual.objectives for individual in population])
+    fronts = fast_non_dominated_sort(objectives)
+    for front_index, front in enumerate(fronts):
+        distances = crowding_distance(objectives[front])
+        for i, distance in zip(front, distances):
+            population[i].pareto_rank = front_index
+            population[i].crowding_distance = distance
+    return fronts
+
+
+def crowded_comparison_key(individual):
+    return -individual.pareto_rank, individual.crowding_distance
+
+
+def select_survivors(population, population_size):
+    """
+    Selects the next generation by Pareto front and crowding distance (NSGA-II environmental selection).
+    """
+
+    assign_pareto_ranks(population)
+    return sorted(population, key=crowded_comparison_key, reverse=True)[:population_size]
+
+
+def update_pareto_archive(archive, population):
+    """
+    Merges the population into the archive, keeping only mutually non-dominated individuals.
+    """
+
+    candidates = archive + population
+    objectives = np.array([individual.objectives for individual in candidates])
+    first_front = fast_non_dominated_sort(objectives)[0]
+
+    new_archive = []
+    seen = set()
+    for i in first_front:
+        signature = tuple(objectives[i])
+        if signature not in seen:
+            seen.add(signature)
+            new_archive.append(candidates[i] if i < len(archive) else copy.deepcopy(candidates[i]))
+    return new_archive
@@ -0,0 +1,45 @@
+import numpy as np
+
+STAGE_INIT = 0
+STAGE_BREED = 1
+STAGE_LOCAL_SEARCH = 2
+
+
+def stream(seed, stage, generation, index):
+    """
+    Returns a counter-based Philox generator keyed by seed and positioned by (stage, generation, index),
+    so the random numbers drawn for an individual do not depend on which rank draws them.
+    """
+
+    # The lowest counter word is advanced by every draw, so the stream coordinates live in the upper words
+    return np.random.Generator(np.random.Philox(key=seed, counter=[0, index, generation, stage]))
+
+
+class GeneratorRandom:
+    """
+    Exposes the subset of the random module API used by the operators on top of a NumPy Generator
+    """
+
+    def __init__(self, generator):
+        self.generator = generator
+
+    def random(self):
+        return float(self.generator.random())
+
+    def randint(self, a, b):
+        return int(self.generator.integers(a, b, endpoint=True))
+
+    def choice(self, seq):
+        return seq[int(self.generator.integers(len(seq)))]
+
+    def sample(self, population, k):
+        indices = self.generator.choice(len(population), size=k, replace=False)
+        return [population[i] for i in indices]
+
+    def shuffle(self, x):
+        permutation = self.generator.permutation(len(x))
+        x[:] = [x[i] for i in permutation]
+
+
+def stream_random(seed, stage, generation, index):
+    return GeneratorRandom(stream(seed, stage, generation, index))
@@ -0,0 +1,72 @@
+import numpy as np
+
+MIN_TRAINING_SAMPLES = 10
+
+
+class SurrogateModel:
+    """
+    Online linear regression mapping the cheap surrogate score to the full fitness
+    """
+
+    def __init__(self, fraction):
+        self.fraction = fraction
+        self.n = 0
+        self.sum_x = 0.0
+        self.sum_y = 0.0
+        self.sum_xx = 0.0
+        self.sum_xy = 0.0
+        self.slope = 1.0
+        self.intercept = 0.0
+        self.report = {}
+
+    def is_trained(self):
+        return self.n >= MIN_TRAINING_SAMPLES
+
+    def predict(self, surrogate_scores):
+        return self.slope * np.asarray(surrogate_scores, dtype=float) + self.intercept
+
+    def update(self, surrogate_scores, fitnesses):
+        """
+        Adds fully evaluated samples and refits the regression coefficients.
+        """
+
+        x = np.asarray(surrogate_scores, dtype=float)
+        y = np.asarray(fitnesses, dtype=float)
+
+        self.n += len(x)
+        self.sum_x += x.sum()
+        self.sum_y += y.sum()
+        self.sum_xx += (x * x).sum()
+        self.sum_xy += (x * y).sum()
+
+        variance = self.n * self.sum_xx - self.sum_x ** 2
+        if self.n > 1 and variance > 1e-9:
+            self.slope = (self.n * self.sum_xy - self.sum_x * self.sum_y) / variance
+            self.intercept = (self.sum_y - self.slope * self.sum_x) / self.n
+        elif self.n > 0:
+            self.slope = 1.0
+            self.intercept = (self.sum_y - self.sum_x) / self.n
+
+    def num_full_evaluations(self, chunk_size):
+        """
+        Returns how many individuals of a chunk should be sent to the full evaluator.
+        """
+
+        if not self.is_trained():
+            return chunk_size
+        return min(chunk_size, max(1, int(np.ceil(self.fraction * chunk_size))))
+
+
+def rank_correlation(a, b):
+    """
+    Computes the Spearman rank correlation of two score vectors.
+    """
+
+    if len(a) < 2:
+        return 1.0
+
+    rank_a = np.argsort(np.argsort(a)).astype(float)
+    rank_b = np.argsort(np.argsort(b)).astype(float)
+    if rank_a.std() == 0 or rank_b.std() == 0:
+        return 1.0
+    return float(np.corrcoef(rank_a, rank_b)[0, 1])
@@ -0,0 +1,181 @@
+import hashlib
+import os
+import tempfile
+
+import numpy as np
+
+from inout.parser import parse_input_file
+
+CACHE_SUFFIX = ".compiled.npz"
+# Bump whenever compile_config changes the arrays it stores, so caches in the old layout are rebuilt
+CACHE_FORMAT = 2
+HASH_CHUNK_SIZE = 1 << 20
+
+
+def file_hash(filepath):
+    """
+    Computes the SHA-256 of a file, reading it in fixed-size chunks.
+    """
+
+    digest = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def point_array(points):
+    values = [(p['x'], p['y']) for p in points]
+    dtype = np.int64 if all(isinstance(v, int) for xy in values for v in xy) else np.float64
+    return np.array(values, dtype=dtype).reshape(-1, 2)
+
+
+def compile_floor(floor, type_index, prefix=""):
+    """
+    Compiles the outline, entrances and room definitions of a single floor.
+    """
+
+    rooms = floor["rooms"]
+    min_areas = [room.get('min_area', 0) for room in rooms]
+    area_dtype = np.int64 if all(isinstance(a, int) for a in min_areas) else np.float64
+
+    return {
+        prefix + "outline": point_array(floor["building_constraints"]),
+        prefix + "entrances": point_array(floor.get("entrances", [])),
+        prefix + "room_type": np.array([type_index[room['type']] for room in rooms], dtype=np.int32),
+        prefix + "room_min_area": np.array(min_areas, dtype=area_dtype),
+        prefix + "room_has_min_area": np.array(['min_area' in room for room in rooms], dtype=bool),
+        prefix + "room_count": np.array([room.get('count', 1) for room in rooms], dtype=np.int32),
+    }
+
+
+def expand_floor(compiled, type_names, prefix=""):
+    rooms = []
+    for t, area, has_area, count in zip(compiled[prefix + "room_type"].tolist(),
+                                        compiled[prefix + "room_min_area"].tolist(),
+                                        compiled[prefix + "room_has_min_area"].tolist(),
+                                        compiled[prefix + "room_count"].tolist()):
+        room = {"type": type_names[t], "count": count}
+        if has_area:
+            room["min_area"] = area
+        rooms.append(room)
+
+    floor = {
+        "building_constraints": [{"x": x, "y": y} for x, y in compiled[prefix + "outline"].tolist()],
+        "rooms": rooms,
+    }
+    if len(compiled[prefix + "entrances"]):
+        floor["entrances"] = [{"x": x, "y": y} for x, y in compiled[prefix + "entrances"].tolist()]
+    return floor
+
+
+def compile_config(config_data):
+    """
+    Normalises a validated configuration into compact typed arrays with room types replaced by indices.
+
+    Multi-floor configurations store each floor's arrays under a 'floor<i>_' prefix.
+    """
+
+    floors = config_data.get("floors", [config_data])
+    names = [room['type'] for floor in floors for room in floor["rooms"]]
+    names += [t for key in ("adjacency_requirements", "separation_requirements") for pair in config_data[key] for t in pair]
+    names += config_data.get("vertical_alignment", [])
+
+    type_names = []
+    type_index = {}
+    for name in names:
+        if name not in type_index:
+            type_index[name] = len(type_names)
+            type_names.append(name)
+
+    compiled = {
+        "corridor_width": np.float64(config_data["corridor_width"]),
+        "type_names": np.array(type_names, dtype=str),
+        "adjacency": np.array([[type_index[t] for t in pair] for pair in config_data["adjacency_requirements"]],
+                              dtype=np.int32).reshape(-1, 2),
+        "separation": np.array([[type_index[t] for t in pair] for pair in config_data["separation_requirements"]],
+                               dtype=np.int32).reshape(-1, 2),
+    }
+
+    if "floors" in config_data:
+        compiled["floor_count"] = np.int32(len(floors))
+        compiled["vertical_alignment"] = np.array(
+            [type_index[t] for t in config_data.get("vertical_alignment", [])], dtype=np.int32
+        )
+        for i, floor in enumerate(floors):
+            compiled.update(compile_floor(floor, type_index, f"floor{i}_"))
+    else:
+        compiled.update(compile_floor(config_data, type_index))
+    return compiled
+
+
+def expand_config(compiled):
+    """
+    Rebuilds the configuration dict used by the evaluator and operators from its compiled form.
+    """
+
+    type_names = compiled["type_names"].tolist()
+    config_data = {
+        "corridor_width": float(compiled["corridor_width"]),
+        "adjacency_requirements": [[type_names[a], type_names[b]] for a, b in compiled["adjacency"].tolist()],
+        "separation_requirements": [[type_names[a], type_names[b]] for a, b in compiled["separation"].tolist()],
+    }
+
+    if "floor_count" in compiled:
+        config_data["floors"] = [expand_floor(compiled, type_names, f"floor{i}_")
+                                 for i in range(int(compiled["floor_count"]))]
+        config_data["vertical_alignment"] = [type_names[t] for t in compiled["vertical_alignment"].tolist()]
+    else:
+        config_data.update(expand_floor(compiled, type_names))
+    return config_data
+
+
+def load_compiled_config(filepath):
+    """
+    Loads the compiled form of a configuration file, reusing the cache stored next to it when the file
+    and the cache format are unchanged.
+    """
+
+    cache_path = filepath + CACHE_SUFFIX
+    try:
+        source_hash = file_hash(filepath)
+    except OSError:
+        return None, f"File not found at '{filepath}'"
+
+    if os.path.exists(cache_path):
+        try:
+            with np.load(cache_path, allow_pickle=False) as cached:
+                if str(cached["source_hash"]) == source_hash and int(cached["cache_format"]) == CACHE_FORMAT:
+                    return {key: cached[key] for key in cached.files if key not in ("source_hash", "cache_format")}, None
+        except (OSError, ValueError, KeyError):
+            pass
+
+    config_data, error = parse_input_file(filepath)
+    if error:
+        return None, error
+
+    compiled = compile_config(config_data)
+    # A uniquely named temporary file keeps concurrent runs on the same configuration from clobbering each other
+    tmp_path = None
+    try:
+        with tempfile.NamedTemporaryFile(dir=os.path.dirname(os.path.abspath(cache_path)), suffix=".tmp.npz",
+                                         delete=False) as f:
+            tmp_path = f.name
+            np.savez(f, source_hash=np.array(source_hash), cache_format=np.array(CACHE_FORMAT), **compiled)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    return compiled, None
+
+
+def load_config(filepath):
+    """
+    Loads a configuration through its compiled cache, returning the configuration dict or an error message.
+    """
+
+    compiled, error = load_compiled_config(filepath)
+    if compiled is None:
+        return None, error
+    return expand_config(compiled), None
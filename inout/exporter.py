@@ -17,7 +17,8 @@ def export_individual(individual, generation_index, file_path):
             "x": room.x,
             "y": room.y,
             "width": room.width,
-            "height": room.height
+            "height": room.height,
+            "floor": room.floor
         }
         result_data["rooms"].append(room_data)
 
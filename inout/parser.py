@@ -1,11 +1,97 @@
 import json
+from numbers import Number
+
+from genetic.chromosome import Chromosome
+from genetic.individual import Individual
+
+FLOOR_KEYS = ["building_constraints", "rooms"]
+
+
+def is_number(value):
+    return isinstance(value, Number) and not isinstance(value, bool)
+
+
+def validate_point(point, where):
+    if not isinstance(point, dict) or not is_number(point.get('x')) or not is_number(point.get('y')):
+        return f"Invalid point in '{where}', expected {{'x': number, 'y': number}}"
+    return None
+
+
+def validate_floor(floor):
+    """
+    Validates the outline, rooms and entrances of a single floor.
+    """
+
+    for key in FLOOR_KEYS:
+        if key not in floor:
+            return f"Missing required key '{key}'"
+
+    outline = floor["building_constraints"]
+    if not isinstance(outline, list) or len(outline) < 3:
+        return "'building_constraints' must be a list of at least 3 points"
+    for point in outline:
+        error = validate_point(point, "building_constraints")
+        if error:
+            return error
+
+    if not isinstance(floor["rooms"], list):
+        return "'rooms' must be a list"
+    for room in floor["rooms"]:
+        if not isinstance(room, dict) or not isinstance(room.get('type'), str):
+            return "Every room must be an object with a string 'type'"
+        if not is_number(room.get('min_area', 0)) or room.get('min_area', 0) < 0:
+            return f"Room '{room['type']}' has an invalid 'min_area'"
+        if not isinstance(room.get('count', 1), int) or room.get('count', 1) < 0:
+            return f"Room '{room['type']}' has an invalid 'count'"
+
+    for entrance in floor.get("entrances", []):
+        error = validate_point(entrance, "entrances")
+        if error:
+            return error
+
+    return None
+
+
+def validate_config(data):
+    """
+    Validates the structure and value types of a configuration in a single pass.
+    """
+
+    if "floors" in data:
+        if not isinstance(data["floors"], list) or not data["floors"]:
+            return "'floors' must be a non-empty list"
+        for i, floor in enumerate(data["floors"]):
+            error = validate_floor(floor) if isinstance(floor, dict) else "Floor must be an object"
+            if error:
+                return f"{error} (floor {i})"
+
+        vertical_alignment = data.get("vertical_alignment", [])
+        if not isinstance(vertical_alignment, list) or not all(isinstance(t, str) for t in vertical_alignment):
+            return "'vertical_alignment' must be a list of room types"
+    else:
+        error = validate_floor(data)
+        if error:
+            return error
+
+    if not is_number(data["corridor_width"]) or data["corridor_width"] < 0:
+        return "'corridor_width' must be a non-negative number"
+
+    for key in ("adjacency_requirements", "separation_requirements"):
+        if not isinstance(data[key], list):
+            return f"'{key}' must be a list"
+        for pair in data[key]:
+            if not isinstance(pair, list) or len(pair) != 2 or not all(isinstance(t, str) for t in pair):
+                return f"Every entry of '{key}' must be a pair of room types"
+
+    return None
+
 
 def parse_input_file(filepath):
     """
     Loads and parses a JSON configuration file.
     """
 
-    REQUIRED_KEYS = ["building_constraints", "corridor_width", "rooms", "adjacency_requirements", "separation_requirements"]
+    REQUIRED_KEYS = ["corridor_width", "adjacency_requirements", "separation_requirements"]
 
     try:
         with open(filepath, "r", encoding="utf-8") as file:
@@ -22,6 +108,10 @@ def parse_input_file(filepath):
             for key in REQUIRED_KEYS:
                 if key not in data:
                     return None, f"Missing required key '{key}' in file: {filepath}"
+
+            error = validate_config(data)
+            if error:
+                return None, f"{error} in file: {filepath}"
             
             return data, None
 
@@ -32,4 +122,29 @@ def parse_input_file(filepath):
         return None, f"Could not decode JSON from '{filepath}'."
 
     except Exception as e:
-        return None, f"An unexpected error occurred while parsing '{filepath}': {e}"
\ No newline at end of file
+        return None, f"An unexpected error occurred while parsing '{filepath}': {e}"
+
+
+def parse_result_file(filepath):
+    """
+    Loads an individual previously saved with export_individual.
+    """
+
+    try:
+        with open(filepath, "r", encoding="utf-8") as file:
+            data = json.load(file)
+
+        chromosomes = [
+            Chromosome(room["type"], room["x"], room["y"], room["width"], room["height"], room.get("floor", 0))
+            for room in data["rooms"]
+        ]
+        return Individual(chromosomes=chromosomes, fitness=data.get("fitness")), None
+
+    except FileNotFoundError:
+        return None, f"File not found at '{filepath}'"
+
+    except json.JSONDecodeError:
+        return None, f"Could not decode JSON from '{filepath}'."
+
+    except (KeyError, TypeError) as e:
+        return None, f"Invalid result file '{filepath}': missing {e}"
\ No newline at end of file
@@ -0,0 +1,196 @@
+import hashlib
+import json
+import sqlite3
+import time
+
+from genetic.chromosome import Chromosome
+from genetic.individual import Individual
+from genetic.floors import floor_configs
+from inout.telemetry import BackgroundWriter, FLUSH_EVERY
+
+STORED_LAYOUTS = 20
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    config_hash TEXT NOT NULL,
+    room_signature TEXT NOT NULL,
+    config_file TEXT,
+    params TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    finished_at REAL,
+    best_fitness REAL
+);
+CREATE TABLE IF NOT EXISTS generations (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    generation INTEGER NOT NULL,
+    best_fitness REAL,
+    avg_fitness REAL,
+    std_fitness REAL,
+    evaluations INTEGER,
+    generation_seconds REAL,
+    PRIMARY KEY (run_id, generation)
+);
+CREATE TABLE IF NOT EXISTS layouts (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    generation INTEGER,
+    fitness REAL NOT NULL,
+    rooms TEXT NOT NULL,
+    UNIQUE (run_id, rooms)
+);
+CREATE INDEX IF NOT EXISTS idx_runs_config_hash ON runs(config_hash);
+CREATE INDEX IF NOT EXISTS idx_runs_room_signature ON runs(room_signature);
+CREATE INDEX IF NOT EXISTS idx_runs_best_fitness ON runs(best_fitness DESC);
+CREATE INDEX IF NOT EXISTS idx_layouts_run_fitness ON layouts(run_id, fitness DESC);
+CREATE INDEX IF NOT EXISTS idx_layouts_fitness ON layouts(fitness DESC);
+"""
+
+
+def config_hash(config_data):
+    """
+    Hashes the content of a configuration, independently of its file formatting.
+    """
+
+    return hashlib.sha256(json.dumps(config_data, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def room_signature(config_data):
+    """
+    Describes the rooms a configuration asks for on each floor; configurations with the same signature
+    produce layouts with the same rooms, so their layouts can seed each other.
+    """
+
+    signature = sorted(
+        (floor, room['type'], room.get('count', 1))
+        for floor, floor_config in enumerate(floor_configs(config_data))
+        for room in floor_config.get('rooms', [])
+    )
+    return json.dumps(signature)
+
+
+def encode_rooms(individual):
+    return json.dumps([room.to_list() + [room.floor] for room in individual.chromosomes])
+
+
+def decode_rooms(rooms):
+    return Individual(chromosomes=[
+        Chromosome(room_type, x, y, width, height, floor) for room_type, x, y, width, height, floor in json.loads(rooms)
+    ])
+
+
+class RunStore:
+    """
+    SQLite database of past runs: their configuration hash, parameters, per-generation statistics and best layouts.
+
+    It also accepts the per-generation metrics records of the evolution loop through emit(), like MetricsEmitter:
+    they are written by a background thread on its own connection, so the evolution loop never waits on SQLite.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.connection = sqlite3.connect(db_path)
+        # Write-ahead logging lets the writer thread commit while the other connection reads
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(SCHEMA)
+        self.run_id = None
+        self.writer = BackgroundWriter("Run store", self._write_generations)
+
+    def start_run(self, config_data, params):
+        cursor = self.connection.execute(
+            "INSERT INTO runs (config_hash, room_signature, config_file, params, started_at) VALUES (?, ?, ?, ?, ?)",
+            (config_hash(config_data), room_signature(config_data), params.get("config_file"),
+             json.dumps(params, sort_keys=True, default=str), time.time())
+        )
+        self.connection.commit()
+        self.run_id = cursor.lastrowid
+        return self.run_id
+
+    def emit(self, record):
+        self.writer.emit((self.run_id, record))
+
+    def _write_generations(self, writer):
+        connection = sqlite3.connect(self.db_path)
+        try:
+            pending = 0
+            for run_id, record in writer.records():
+                connection.execute(
+                    "INSERT OR REPLACE INTO generations VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (run_id, record['generation'], record.get('best_fitness'), record.get('avg_fitness'),
+                     record.get('std_fitness'), record.get('evaluations'), record.get('generation_seconds'))
+                )
+                pending += 1
+                if pending >= FLUSH_EVERY or writer.idle():
+                    connection.commit()
+                    pending = 0
+            connection.commit()
+        finally:
+            connection.close()
+
+    def finish_run(self, layouts, limit=STORED_LAYOUTS):
+        """
+        Stores the best distinct layouts of the run, given as (generation, individual) pairs, and closes the run.
+        """
+
+        self.writer.close()
+        best = {}
+        for generation, individual in sorted(layouts, key=lambda item: item[1].fitness, reverse=True):
+            rooms = encode_rooms(individual)
+            if rooms not in best and len(best) < limit:
+                best[rooms] = (generation, individual.fitness)
+
+        self.connection.executemany(
+            "INSERT OR IGNORE INTO layouts (run_id, generation, fitness, rooms) VALUES (?, ?, ?, ?)",
+            [(self.run_id, generation, float(fitness), rooms) for rooms, (generation, fitness) in best.items()]
+        )
+        best_fitness = max((fitness for _, fitness in best.values()), default=None)
+        self.connection.execute(
+            "UPDATE runs SET finished_at = ?, best_fitness = ? WHERE id = ?", (time.time(), best_fitness, self.run_id)
+        )
+        self.connection.commit()
+
+    def best_layouts(self, config_data, limit):
+        """
+        Returns up to limit of the best stored layouts for this configuration, topped up with layouts
+        from configurations that ask for the same rooms (e.g. an edited building outline).
+
+        Each entry is an (individual, exact) pair, where exact tells whether it came from the same configuration.
+        """
+
+        exact_hash = config_hash(config_data)
+        rows = self.connection.execute(
+            "SELECT layouts.rooms, runs.config_hash = ? FROM layouts JOIN runs ON runs.id = layouts.run_id "
+            "WHERE runs.config_hash = ? OR runs.room_signature = ? "
+            "ORDER BY runs.config_hash = ? DESC, layouts.fitness DESC",
+            (exact_hash, exact_hash, room_signature(config_data), exact_hash)
+        )
+
+        seen = set()
+        layouts = []
+        for rooms, exact in rows:
+            if rooms in seen:
+                continue
+            seen.add(rooms)
+            layouts.append((decode_rooms(rooms), bool(exact)))
+            if len(layouts) >= limit:
+                break
+        return layouts
+
+    def runs(self, config_data=None):
+        """
+        Lists stored runs as dicts, best first, optionally only those of a configuration.
+        """
+
+        query = "SELECT id, config_file, started_at, finished_at, best_fitness FROM runs"
+        args = ()
+        if config_data is not None:
+            query += " WHERE config_hash = ?"
+            args = (config_hash(config_data),)
+        query += " ORDER BY best_fitness DESC"
+        columns = ("id", "config_file", "started_at", "finished_at", "best_fitness")
+        return [dict(zip(columns, row)) for row in self.connection.execute(query, args)]
+
+    def close(self):
+        self.writer.close()
+        self.connection.commit()
+        self.connection.close()
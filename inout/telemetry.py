@@ -0,0 +1,150 @@
+import json
+import os
+import queue
+import threading
+
+FLUSH_EVERY = 10
+QUEUE_SIZE = 1000
+POLL_INTERVAL = 0.1
+
+
+class BackgroundWriter:
+    """
+    Feeds records to a write function running on a daemon thread, through a bounded queue.
+
+    emit() never blocks and drops records when the queue is full. If the write function raises, its exception
+    is kept and reported once, later records are dropped, and close() returns without waiting on the dead thread.
+    """
+
+    def __init__(self, name, write):
+        self.name = name
+        self.dropped = 0
+        self.error = None
+        self._reported = False
+        self._write = write
+        self._queue = queue.Queue(maxsize=QUEUE_SIZE)
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def emit(self, record):
+        if self.error is not None:
+            self.dropped += 1
+            self.report()
+            return
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def records(self):
+        """
+        Yields queued records until close() is called; used by the write function.
+        """
+
+        while True:
+            record = self._queue.get()
+            if record is None:
+                return
+            yield record
+
+    def idle(self):
+        return self._queue.empty()
+
+    def close(self):
+        if self._thread is None:
+            return
+        while self._thread.is_alive():
+            try:
+                self._queue.put(None, timeout=POLL_INTERVAL)
+                break
+            except queue.Full:
+                continue
+        self._thread.join()
+        self._thread = None
+        self.report()
+
+    def report(self):
+        if self.error is not None and not self._reported:
+            self._reported = True
+            print(f"{self.name} stopped writing: {type(self.error).__name__}: {self.error}")
+
+    def _run(self):
+        try:
+            self._write(self)
+        except Exception as e:
+            self.error = e
+
+
+class MetricsEmitter:
+    """
+    Writes per-generation metrics from a background thread, either as newline-delimited JSON
+    or as a Prometheus text file rewritten in place.
+    """
+
+    def __init__(self, file_path, fmt="ndjson"):
+        if fmt not in ("ndjson", "prometheus"):
+            raise ValueError(f"Unknown telemetry format '{fmt}'")
+
+        self.file_path = file_path
+        self.fmt = fmt
+        write = self._write_ndjson if fmt == "ndjson" else self._write_prometheus
+        self.writer = BackgroundWriter("Telemetry", write)
+
+    def emit(self, record):
+        """
+        Queues a metrics record without blocking; records are dropped if the writer falls behind or has failed.
+        """
+
+        self.writer.emit(record)
+
+    def close(self):
+        self.writer.close()
+
+    def _write_ndjson(self, writer):
+        with open(self.file_path, "a", encoding="utf-8") as f:
+            pending = 0
+            for record in writer.records():
+                f.write(json.dumps(record) + "\n")
+                pending += 1
+                if pending >= FLUSH_EVERY or writer.idle():
+                    f.flush()
+                    pending = 0
+
+    def _write_prometheus(self, writer):
+        tmp_path = self.file_path + ".tmp"
+        for record in writer.records():
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(format_prometheus(record))
+            os.replace(tmp_path, self.file_path)
+
+
+def format_prometheus(record):
+    """
+    Formats a metrics record in the Prometheus text exposition format.
+    """
+
+    lines = []
+    for key, value in record.items():
+        if isinstance(value, list):
+            for rank, item in enumerate(value):
+                lines.append(f'floorplanner_{key}{{rank="{rank}"}} {item}')
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            lines.append(f"floorplanner_{key} {value}")
+    return "\n".join(lines) + "\n"
+
+
+class FanoutEmitter:
+    """
+    Forwards every metrics record to several emitters.
+    """
+
+    def __init__(self, emitters):
+        self.emitters = emitters
+
+    def emit(self, record):
+        for emitter in self.emitters:
+            emitter.emit(record)
+
+    def close(self):
+        for emitter in self.emitters:
+            emitter.close()
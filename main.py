@@ -1,10 +1,17 @@
 import time
+
+START_TIME = time.perf_counter()
+
 from mpi4py import MPI
 import sys
 
 from runner.runner import run_evolution
-from visualization.main_window import MainWindow
-from PyQt5.QtWidgets import QApplication
+
+
+def print_startup_report(startup_times):
+    print("=== Startup time per rank ===")
+    for rank, seconds in enumerate(startup_times):
+        print(f"rank {rank:<4}: {seconds:>6.2f} s")
 
 
 def main():
@@ -12,6 +19,14 @@ def main():
     rank = comm.Get_rank()
 
     if rank == 0:
+        # The GUI stack is only needed on rank 0; worker ranks import just the evaluation code
+        from PyQt5.QtWidgets import QApplication
+        from visualization.main_window import MainWindow
+
+    startup_times = comm.gather(time.perf_counter() - START_TIME, root=0)
+
+    if rank == 0:
+        print_startup_report(startup_times)
         app = QApplication(sys.argv)
         window = MainWindow(comm)
         window.show()
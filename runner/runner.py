@@ -1,58 +1,177 @@
+import sqlite3
 import time
 
 from genetic.evolution import run_evolution_parallel
-from genetic.operators import initialize_population
-from inout.parser import parse_input_file
+from genetic.distributed import run_evolution_distributed, shard_bounds
+from genetic.kernels import set_backend
+from genetic.floors import floor_configs, initialize_building_population, repair_building
+from inout.compiled_config import load_compiled_config, expand_config
+from inout.run_store import RunStore
+from inout.telemetry import FanoutEmitter, MetricsEmitter
+
+
+def warm_start_population(population, store, config_data, fraction):
+    """
+    Replaces a fraction of a fresh population with the best stored layouts for this configuration
+    or one asking for the same rooms.
+
+    Layouts from a different configuration are repaired to fit the current building outline.
+    """
+
+    room_order = {
+        (floor, room['type']): position
+        for floor, floor_config in enumerate(floor_configs(config_data))
+        for position, room in enumerate(floor_config.get('rooms', []))
+    }
+
+    seeds = store.best_layouts(config_data, int(fraction * len(population)))
+    for i, (individual, exact) in enumerate(seeds):
+        individual.chromosomes.sort(key=lambda room: (room.floor, room_order[(room.floor, room.room_type)]))
+        if not exact:
+            repair_building(individual, config_data)
+        population[i] = individual
+    return len(seeds)
 
 
 def run_evolution(comm, params, debug=False):
     """
     Runs the parallel genetic algorithm using MPI.
+
+    Configuration and initialisation errors end the run on every rank and return None instead of aborting the job.
     """
 
     rank = comm.Get_rank()
     config_data = None
     params = comm.bcast(params, root=0)
+    set_backend(params.get("evaluator_backend", "shapely"))
 
+    compiled_config = None
     if rank == 0:
         input_filepath = params['config_file']
-        config_data, error_msg = parse_input_file(input_filepath)
-        if not config_data:
-            print("Error: Could not load configuration data. Exiting.")
-            comm.Abort()
+        compiled_config, error_msg = load_compiled_config(input_filepath)
+        if compiled_config is None:
+            print(f"Error: Could not load configuration data: {error_msg}")
 
-    config_data = comm.bcast(config_data, root=0)
-    building_constraints = config_data["building_constraints"]
+    compiled_config = comm.bcast(compiled_config, root=0)
+    if compiled_config is None:
+        return None
+    config_data = expand_config(compiled_config)
 
+    distributed = params.get("distributed", False)
     population = None
-    if rank == 0:
-        if debug:
-            print("Configuration loaded successfully")
-            print("Initializing population")
-        population = initialize_population(config_data, params["population_size"], building_constraints)
+    if distributed:
+        # Every rank builds and keeps only its own shard of the population
+        start, stop = shard_bounds(params["population_size"], comm.Get_size())[rank]
+        population = initialize_building_population(config_data, stop - start, params.get("seed"), start)
+        if not all(comm.allgather(len(population) == stop - start)):
+            if rank == 0:
+                print("Population initialisation failed")
+            return None
+    else:
+        if rank == 0:
+            if debug:
+                print("Configuration loaded successfully")
+                print("Initializing population")
+            population = initialize_building_population(config_data, params["population_size"], params.get("seed"))
+
+            if not population:
+                print("Population initialisation failed")
+            elif debug:
+                print("Population successfully initialised")
+
+        if not comm.bcast(bool(population), root=0):
+            return None
 
-        if not population:
-            print("Population initialisation failed")
-            comm.Abort()
-        elif debug:
-            print("Population successfully initialised")
+    store = None
+    if rank == 0 and params.get("run_store"):
+        try:
+            store = RunStore(params["run_store"])
+            if params.get("warm_start"):
+                seeded = warm_start_population(population, store, config_data, params["warm_start"])
+                print(f"Warm start: seeded {seeded} individuals from {params['run_store']}")
+            store.start_run(config_data, params)
+        except sqlite3.Error as e:
+            print(f"Run store unavailable, continuing without it: {e}")
+            if store is not None:
+                store.writer.close()
+            store = None
 
     start_time = 0
+    telemetry = None
     if rank == 0:
         start_time = time.time()
+        emitters = []
+        if params.get("telemetry_path"):
+            emitters.append(MetricsEmitter(params["telemetry_path"], params.get("telemetry_format", "ndjson")))
+        if store is not None:
+            emitters.append(store)
+        if len(emitters) > 1:
+            telemetry = FanoutEmitter(emitters)
+        elif emitters:
+            telemetry = emitters[0]
+
+    if distributed:
+        unsupported = [key for key in ("local_search_top_k", "multi_objective", "rank_timeout") if params.get(key)]
+        if params.get("surrogate_fraction", 1.0) < 1.0:
+            unsupported.append("surrogate_fraction")
+        if unsupported and rank == 0:
+            print(f"Ignoring options not supported with a distributed population: {', '.join(unsupported)}")
+
+        final_population, hall_of_fame = run_evolution_distributed(
+            population,
+            config_data,
+            params["num_generations"],
+            params["population_size"],
+            params["tournament_size"],
+            params["crossover_prob"],
+            params["mutation_prob"],
+            params["early_stopping"],
+            comm,
+            repair_prob=params.get("repair_prob", 0.0),
+            local_workers=params.get("local_workers", 0),
+            evaluation_timeout=params.get("evaluation_timeout"),
+            telemetry=telemetry,
+            seed=params.get("seed"),
+            debug=debug
+        )
+    else:
+        final_population, hall_of_fame = run_evolution_parallel(
+            population,
+            config_data,
+            params["num_generations"],
+            params["population_size"],
+            params["tournament_size"],
+            params["crossover_prob"],
+            params["mutation_prob"],
+            params["early_stopping"],
+            comm,
+            local_search_top_k=params.get("local_search_top_k", 0),
+            local_search_steps=params.get("local_search_steps", 20),
+            surrogate_fraction=params.get("surrogate_fraction", 1.0),
+            repair_prob=params.get("repair_prob", 0.0),
+            local_workers=params.get("local_workers", 0),
+            evaluation_timeout=params.get("evaluation_timeout"),
+            rank_timeout=params.get("rank_timeout"),
+            multi_objective=params.get("multi_objective", False),
+            telemetry=telemetry,
+            seed=params.get("seed"),
+            debug=debug
+        )
+
+    if store is not None and final_population is not None:
+        if params.get("multi_objective", False) and not distributed:
+            # The hall of fame is the Pareto archive, whose members carry no generation
+            stored = [(None, individual) for individual in final_population + hall_of_fame]
+        else:
+            stored = [(generation, individual) for generation, individual in enumerate(hall_of_fame)]
+            stored += [(len(hall_of_fame) - 1, individual) for individual in final_population]
+        try:
+            store.finish_run(stored)
+        except sqlite3.Error as e:
+            print(f"Could not record the run in the run store: {e}")
 
-    final_population, hall_of_fame = run_evolution_parallel(
-        population,
-        config_data,
-        params["num_generations"],
-        params["population_size"],
-        params["tournament_size"],
-        params["crossover_prob"],
-        params["mutation_prob"],
-        params["early_stopping"],
-        comm,
-        debug=True
-    )
+    if telemetry is not None:
+        telemetry.close()
 
     if final_population is None:
         return None
@@ -0,0 +1,83 @@
+import random
+from itertools import combinations
+
+import pytest
+
+from genetic.chromosome import Chromosome
+from genetic.evaluator import compute_adjacency_score, compute_shared_wall_score, get_room_box, get_room_center
+from genetic.kernels import NumpyKernels, pairwise_terms
+
+BACKENDS = [NumpyKernels]
+try:
+    from genetic.kernels_numba import NumbaKernels
+    BACKENDS.append(NumbaKernels)
+except ImportError:
+    pass
+
+ROOM_TYPES = ["Kitchen", "Bathroom", "Bedroom", "LivingRoom"]
+REQUIREMENTS = [("Kitchen", "LivingRoom"), ("Bedroom", "Bathroom"), ("Kitchen", "Bedroom"), ("Office", "Kitchen")]
+
+
+def reference_terms(chromosomes, adjacency_requirements, corridor_width):
+    room_boxes = {room: get_room_box(room) for room in chromosomes}
+    room_centers = {room: get_room_center(room) for room in chromosomes}
+    return (
+        compute_shared_wall_score(list(combinations(chromosomes, 2)), room_boxes, corridor_width),
+        compute_adjacency_score(chromosomes, room_centers, adjacency_requirements),
+    )
+
+
+def random_layout(rng, num_rooms, extent=20, max_size=6):
+    return [
+        Chromosome(rng.choice(ROOM_TYPES), rng.randint(0, extent), rng.randint(0, extent),
+                   rng.randint(1, max_size), rng.randint(1, max_size))
+        for _ in range(num_rooms)
+    ]
+
+
+def assert_parity(backend, chromosomes, adjacency_requirements, corridor_width):
+    expected = reference_terms(chromosomes, adjacency_requirements, corridor_width)
+    actual = pairwise_terms(backend, chromosomes, adjacency_requirements, corridor_width)
+    assert actual == pytest.approx(expected, rel=1e-9, abs=1e-9)
+
+
+@pytest.mark.parametrize("backend", BACKENDS, ids=lambda backend: backend.name)
+@pytest.mark.parametrize("seed", range(20))
+def test_random_layouts(backend, seed):
+    rng = random.Random(seed)
+    chromosomes = random_layout(rng, rng.randint(2, 12))
+    assert_parity(backend, chromosomes, REQUIREMENTS, rng.choice([0, 1, 2, 3]))
+
+
+@pytest.mark.parametrize("backend", BACKENDS, ids=lambda backend: backend.name)
+@pytest.mark.parametrize("rooms", [
+    pytest.param([("Kitchen", 0, 0, 4, 3), ("LivingRoom", 4, 0, 5, 3)], id="touching-edge"),
+    pytest.param([("Kitchen", 0, 0, 4, 3), ("LivingRoom", 4, 3, 2, 2)], id="touching-corner"),
+    pytest.param([("Kitchen", 0, 0, 4, 3), ("LivingRoom", 0, 3, 4, 3)], id="collinear-full"),
+    pytest.param([("Kitchen", 0, 0, 4, 3), ("LivingRoom", 2, 3, 5, 2)], id="collinear-partial"),
+    pytest.param([("Kitchen", 0, 0, 4, 4), ("LivingRoom", 0, 1, 4, 2)], id="overlapping-shared-sides"),
+    pytest.param([("Kitchen", 0, 0, 4, 4), ("LivingRoom", 2, 2, 4, 4)], id="overlapping"),
+    pytest.param([("Kitchen", 0, 0, 6, 6), ("LivingRoom", 2, 2, 2, 2)], id="contained"),
+    pytest.param([("Kitchen", 0, 0, 4, 3), ("LivingRoom", 4, 0, 4, 3)], id="identical-size-touching"),
+    pytest.param([("Kitchen", 0, 0, 3, 3), ("LivingRoom", 0, 0, 3, 3)], id="identical"),
+    pytest.param([("Kitchen", 0, 0, 4, 3), ("LivingRoom", 6, 0, 4, 3)], id="within-corridor"),
+    pytest.param([("Kitchen", 0, 0, 4, 3), ("LivingRoom", 6, 5, 4, 3)], id="within-corridor-diagonal"),
+    pytest.param([("Kitchen", 0, 0, 4, 3), ("LivingRoom", 7, 0, 4, 3)], id="at-corridor-width"),
+    pytest.param([("Kitchen", 0, 0, 4, 3), ("LivingRoom", 9, 0, 4, 3)], id="beyond-corridor"),
+])
+def test_edge_cases(backend, rooms):
+    chromosomes = [Chromosome(*room) for room in rooms]
+    assert_parity(backend, chromosomes, REQUIREMENTS, 3)
+
+
+@pytest.mark.parametrize("backend", BACKENDS, ids=lambda backend: backend.name)
+def test_missing_requirement_types(backend):
+    chromosomes = [Chromosome("Kitchen", 0, 0, 4, 3), Chromosome("Bedroom", 10, 10, 3, 3)]
+    requirements = [("Office", "Garage"), ("Kitchen", "Office"), ("Garage", "Bedroom"), ("Kitchen", "Bedroom")]
+    assert_parity(backend, chromosomes, requirements, 2)
+
+
+@pytest.mark.parametrize("backend", BACKENDS, ids=lambda backend: backend.name)
+def test_no_requirements(backend):
+    chromosomes = random_layout(random.Random(0), 5)
+    assert_parity(backend, chromosomes, [], 2)
@@ -1,12 +1,20 @@
 import json
 import os
-from PyQt5.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QSpinBox, QDoubleSpinBox, QPushButton, QSlider, QFileDialog, QMessageBox, QCheckBox
+from PyQt5.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QSpinBox, QDoubleSpinBox, QPushButton, QSlider, QFileDialog, QMessageBox, QCheckBox, QComboBox, QGridLayout
 from PyQt5.QtCore import Qt
 
 from runner.runner import run_evolution
-from .renderer import BuildingWidget
-from inout.parser import parse_input_file
+from .renderer import BuildingWidget, changed_room_indices, plan_bounds
+from .offscreen import render_batch
+from inout.compiled_config import load_config
 from inout.exporter import export_individual
+from genetic.floors import floor_configs, is_multi_floor
+from genetic.individual import Individual
+from genetic.kernels import BACKENDS
+
+RUN_STORE_NAME = "runs.sqlite"
+TELEMETRY_FILES = {"ndjson": "telemetry.ndjson", "prometheus": "telemetry.prom"}
+ADVANCED_COLUMNS = 4
 
 class MainWindow(QMainWindow):
     def __init__(self, comm):
@@ -19,6 +27,7 @@ class MainWindow(QMainWindow):
         self.config_file_path = None
         self.config_data = None
         self.history = []
+        self.floor_views = {}
 
         main_widget = QWidget()
         self.setCentralWidget(main_widget)
@@ -38,7 +47,10 @@ class MainWindow(QMainWindow):
         self.start_button.clicked.connect(self.start)
         self.choose_file_button.clicked.connect(self.open_file)
         self.iter_slider.valueChanged.connect(self.on_slider_change)
+        self.floor_widget.valueChanged.connect(self.on_floor_change)
         self.save_button.clicked.connect(self.save_current_result)
+        self.render_button.clicked.connect(self.render_history)
+        self.highlight_checkbox.toggled.connect(self.redraw)
 
 
     def _create_top_bar(self):
@@ -107,6 +119,10 @@ class MainWindow(QMainWindow):
         params_layout.addStretch()
         top_layout.addLayout(params_layout)
 
+        self.advanced_panel = self._create_advanced_panel()
+        self.advanced_panel.setVisible(False)
+        top_layout.addWidget(self.advanced_panel)
+
         controls_layout = QHBoxLayout()
         self.file_label = QLabel("")
         self.choose_file_button = QPushButton("Choose File")
@@ -117,12 +133,115 @@ class MainWindow(QMainWindow):
         controls_layout.addWidget(self.choose_file_button)
         controls_layout.addSpacing(20)
         controls_layout.addWidget(self.start_button)
+        controls_layout.addSpacing(20)
+        self.advanced_button = QPushButton("Advanced Options")
+        self.advanced_button.setCheckable(True)
+        self.advanced_button.toggled.connect(self.advanced_panel.setVisible)
+        controls_layout.addWidget(self.advanced_button)
         controls_layout.addStretch()
         top_layout.addLayout(controls_layout)
 
         return top_panel
 
 
+    def _create_advanced_panel(self):
+        advanced_panel = QWidget()
+        advanced_layout = QGridLayout(advanced_panel)
+        advanced_layout.setContentsMargins(0, 0, 0, 0)
+        options = []
+
+        ls_widget = QSpinBox()
+        ls_widget.setRange(0, 100)
+        ls_widget.setValue(0)
+        ls_widget.setMinimumWidth(60)
+        self.params_widgets["local_search_top_k"] = ls_widget
+        options.append(("Local Search Top-K:", ls_widget))
+
+        sur_widget = QDoubleSpinBox()
+        sur_widget.setRange(0.05, 1.0)
+        sur_widget.setSingleStep(0.05)
+        sur_widget.setValue(1.0)
+        sur_widget.setMinimumWidth(60)
+        self.params_widgets["surrogate_fraction"] = sur_widget
+        options.append(("Surrogate Fraction:", sur_widget))
+
+        rep_widget = QDoubleSpinBox()
+        rep_widget.setRange(0.0, 1.0)
+        rep_widget.setSingleStep(0.05)
+        rep_widget.setValue(0.0)
+        rep_widget.setMinimumWidth(60)
+        self.params_widgets["repair_prob"] = rep_widget
+        options.append(("Repair Probability:", rep_widget))
+
+        workers_widget = QSpinBox()
+        workers_widget.setRange(-1, 256)
+        workers_widget.setSpecialValueText("Auto")
+        workers_widget.setValue(0)
+        workers_widget.setMinimumWidth(60)
+        self.params_widgets["local_workers"] = workers_widget
+        options.append(("Local Workers:", workers_widget))
+
+        self.eval_timeout_widget = QDoubleSpinBox()
+        self.eval_timeout_widget.setRange(0.0, 3600.0)
+        self.eval_timeout_widget.setSpecialValueText("Off")
+        self.eval_timeout_widget.setValue(0.0)
+        self.eval_timeout_widget.setMinimumWidth(60)
+        options.append(("Eval Timeout (s):", self.eval_timeout_widget))
+
+        self.rank_timeout_widget = QDoubleSpinBox()
+        self.rank_timeout_widget.setRange(0.0, 3600.0)
+        self.rank_timeout_widget.setSpecialValueText("Off")
+        self.rank_timeout_widget.setValue(0.0)
+        self.rank_timeout_widget.setMinimumWidth(60)
+        options.append(("Rank Timeout (s):", self.rank_timeout_widget))
+
+        # Any seed can be chosen, so whether one is used is a separate checkbox
+        self.seed_checkbox = QCheckBox("Fixed Seed:")
+        self.seed_widget = QSpinBox()
+        self.seed_widget.setRange(0, 2**31 - 1)
+        self.seed_widget.setValue(0)
+        self.seed_widget.setMinimumWidth(60)
+        self.seed_widget.setEnabled(False)
+        self.seed_checkbox.toggled.connect(self.seed_widget.setEnabled)
+        options.append((self.seed_checkbox, self.seed_widget))
+
+        self.backend_widget = QComboBox()
+        self.backend_widget.addItems(BACKENDS)
+        options.append(("Backend:", self.backend_widget))
+
+        self.telemetry_widget = QComboBox()
+        self.telemetry_widget.addItems(["Off"] + list(TELEMETRY_FILES))
+        options.append(("Telemetry:", self.telemetry_widget))
+
+        self.warm_start_widget = QDoubleSpinBox()
+        self.warm_start_widget.setRange(0.0, 1.0)
+        self.warm_start_widget.setSingleStep(0.1)
+        self.warm_start_widget.setSpecialValueText("Off")
+        self.warm_start_widget.setValue(0.0)
+        self.warm_start_widget.setMinimumWidth(60)
+        options.append(("Warm Start:", self.warm_start_widget))
+
+        self.multi_objective_checkbox = QCheckBox("Multi-Objective")
+        options.append((None, self.multi_objective_checkbox))
+
+        self.distributed_checkbox = QCheckBox("Distributed Population")
+        options.append((None, self.distributed_checkbox))
+
+        self.run_store_checkbox = QCheckBox("Record Run")
+        options.append((None, self.run_store_checkbox))
+
+        for i, (label, widget) in enumerate(options):
+            row, column = divmod(i, ADVANCED_COLUMNS)
+            if label is None:
+                advanced_layout.addWidget(widget, row, 2 * column, 1, 2)
+                continue
+            advanced_layout.addWidget(QLabel(label) if isinstance(label, str) else label, row, 2 * column)
+            advanced_layout.addWidget(widget, row, 2 * column + 1)
+        advanced_layout.setColumnStretch(2 * ADVANCED_COLUMNS, 1)
+
+        return advanced_panel
+
+
     def _create_bottom_bar(self):
         bottom_panel = QWidget()
         bottom_panel.setStyleSheet("background-color: #333; color: white;")
@@ -131,10 +250,19 @@ class MainWindow(QMainWindow):
         self.iter_label = QLabel("Generation: 0")
         self.iter_slider.setEnabled(False)
         self.save_button = QPushButton("Save Result")
+        self.render_button = QPushButton("Render History")
+        self.floor_label = QLabel("Floor:")
+        self.floor_widget = QSpinBox()
+        self.floor_widget.setRange(0, 0)
+        self.highlight_checkbox = QCheckBox("Highlight Changes")
         bottom_layout.addSpacing(20)
         bottom_layout.addWidget(self.iter_slider, 1) 
         bottom_layout.addWidget(self.iter_label)
+        bottom_layout.addWidget(self.floor_label)
+        bottom_layout.addWidget(self.floor_widget)
+        bottom_layout.addWidget(self.highlight_checkbox)
         bottom_layout.addWidget(self.save_button)
+        bottom_layout.addWidget(self.render_button)
         bottom_layout.addSpacing(20)
         return bottom_panel
 
@@ -146,28 +274,67 @@ class MainWindow(QMainWindow):
             self.config_file_path = filePath
             self.file_label.setText(f"Selected file: {os.path.basename(filePath)}")
             
-            self.config_data, error = parse_input_file(self.config_file_path)
+            self.config_data, error = load_config(self.config_file_path)
             if error:
                 QMessageBox.critical(self, "File Error", error)
                 self.config_data = None
                 return
 
-            self.building_widget.update_plan(
-                None, 
-                self.config_data["building_constraints"],
-                self.config_data.get("entrances")
-            )
+            self.floor_views = {}
+            self.floor_widget.setRange(0, len(floor_configs(self.config_data)) - 1)
+            self.floor_widget.setValue(0)
+            self.show_floor(None)
+
+    def floor_view(self, floor):
+        """
+        Returns each generation's individual restricted to the given floor together with its plan bounds,
+        computed once per floor so that scrubbing through the history only repaints the rooms.
+        """
+
+        if floor not in self.floor_views:
+            outline = floor_configs(self.config_data)[floor]["building_constraints"]
+            view = []
+            for individual in self.history:
+                if is_multi_floor(self.config_data):
+                    individual = Individual(chromosomes=[room for room in individual.chromosomes if room.floor == floor])
+                view.append((individual, plan_bounds(individual, outline)))
+            self.floor_views[floor] = view
+        return self.floor_views[floor]
+
+    def show_floor(self, generation):
+        floor = self.floor_widget.value()
+        floor_config = floor_configs(self.config_data)[floor]
+        individual, bounds, changed_rooms = None, None, None
+        if generation is not None:
+            view = self.floor_view(floor)
+            individual, bounds = view[generation]
+            if self.highlight_checkbox.isChecked() and generation > 0:
+                changed_rooms = changed_room_indices(individual, view[generation - 1][0])
+        self.building_widget.update_plan(
+            individual,
+            floor_config["building_constraints"],
+            floor_config.get("entrances"),
+            bounds,
+            changed_rooms
+        )
 
     def on_slider_change(self, value):
         if self.history and 0 <= value < len(self.history):
-            individual_to_show = self.history[value]
-            self.building_widget.update_plan(
-                individual_to_show, 
-                self.config_data["building_constraints"],
-                self.config_data.get("entrances")
-            )
+            self.show_floor(value)
             self.iter_label.setText(f"Generation: {value}")
 
+    def on_floor_change(self, value):
+        self.redraw()
+
+    def redraw(self):
+        if not self.config_data:
+            return
+        current = self.iter_slider.value()
+        if self.history and 0 <= current < len(self.history):
+            self.show_floor(current)
+        else:
+            self.show_floor(None)
+
     def save_current_result(self):
         if not self.history:
             QMessageBox.warning(self, "No Results", "There are no results to save.")
@@ -187,12 +354,31 @@ class MainWindow(QMainWindow):
             else:
                 QMessageBox.critical(self, "Save Error", "An error occurred while saving the file.")
 
+    def render_history(self):
+        if not self.history:
+            QMessageBox.warning(self, "No Results", "There are no results to render.")
+            return
+
+        output_dir = QFileDialog.getExistingDirectory(self, "Select Output Directory")
+        if not output_dir:
+            return
+
+        floor = self.floor_widget.value()
+        floor_config = floor_configs(self.config_data)[floor]
+        individuals = [
+            Individual(chromosomes=[room for room in individual.chromosomes if room.floor == floor])
+            for individual in self.history
+        ]
+        paths = render_batch(individuals, floor_config["building_constraints"], floor_config.get("entrances"),
+                             output_dir, prefix="generation")
+        QMessageBox.information(self, "Success", f"Rendered {len(paths)} layouts to:\n{output_dir}")
+
     def start(self):
         if not self.config_file_path:
             QMessageBox.warning(self, "No File Selected", "Please select a configuration file before starting the evolution.")
             return
         
-        self.config_data, error_msg = parse_input_file(self.config_file_path)
+        self.config_data, error_msg = load_config(self.config_file_path)
         if error_msg:
             QMessageBox.critical(self, "File Error", f"Cannot start evolution due to a file error:\n{error_msg}")
             return
@@ -203,6 +389,23 @@ class MainWindow(QMainWindow):
 
         self.params['config_file'] = self.config_file_path
         self.params['early_stopping'] = self.early_stopping_checkbox.isChecked()
+        self.params['multi_objective'] = self.multi_objective_checkbox.isChecked()
+        self.params['distributed'] = self.distributed_checkbox.isChecked()
+        self.params['seed'] = self.seed_widget.value() if self.seed_checkbox.isChecked() else None
+        self.params['evaluation_timeout'] = self.eval_timeout_widget.value() or None
+        self.params['rank_timeout'] = self.rank_timeout_widget.value() or None
+        if self.run_store_checkbox.isChecked() or self.warm_start_widget.value():
+            self.params['run_store'] = os.path.join(os.path.dirname(self.config_file_path), RUN_STORE_NAME)
+        self.params['warm_start'] = self.warm_start_widget.value()
+        self.params['evaluator_backend'] = self.backend_widget.currentText()
+        telemetry_format = self.telemetry_widget.currentText()
+        if telemetry_format in TELEMETRY_FILES:
+            self.params['telemetry_path'] = os.path.join(
+                os.path.dirname(self.config_file_path), TELEMETRY_FILES[telemetry_format]
+            )
+            self.params['telemetry_format'] = telemetry_format
+        else:
+            self.params.pop('telemetry_path', None)
 
         size = self.comm.Get_size()
 
@@ -210,6 +413,7 @@ class MainWindow(QMainWindow):
             self.comm.send("START", dest=worker, tag=900)
 
         self.history = run_evolution(self.comm, self.params)
+        self.floor_views = {}
 
         if self.history:
             self.iter_slider.setRange(0, len(self.history) - 1)
@@ -0,0 +1,179 @@
+import argparse
+import math
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+
+from PyQt5.QtCore import QBuffer, QByteArray, QIODevice, Qt
+from PyQt5.QtGui import QGuiApplication, QImage, QPainter
+
+from .renderer import paint_plan
+
+DEFAULT_SIZE = 400
+
+_app = None
+
+
+def ensure_gui_application():
+    """
+    Creates a headless Qt application in this process if none exists; text rendering needs one.
+    """
+
+    global _app
+
+    if QGuiApplication.instance() is None:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        _app = QGuiApplication(sys.argv[:1])
+
+
+def render_individual(individual, outline, entrances=None, width=DEFAULT_SIZE, height=DEFAULT_SIZE):
+    """
+    Renders a floor plan into a QImage without a window.
+    """
+
+    ensure_gui_application()
+    image = QImage(width, height, QImage.Format_ARGB32)
+    image.fill(Qt.white)
+
+    painter = QPainter(image)
+    painter.setRenderHint(QPainter.Antialiasing)
+    paint_plan(painter, width, height, individual, outline, entrances)
+    painter.end()
+    return image
+
+
+def render_task(task):
+    """
+    Renders one individual in a worker process, either saving it as PNG or returning the encoded PNG bytes.
+    """
+
+    individual, outline, entrances, width, height, file_path = task
+    image = render_individual(individual, outline, entrances, width, height)
+
+    if file_path is not None:
+        image.save(file_path, "PNG")
+        return file_path
+
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.WriteOnly)
+    image.save(buffer, "PNG")
+    return bytes(data)
+
+
+def run_tasks(tasks, processes):
+    """
+    Runs render tasks split across fresh Python processes and returns their results in order.
+
+    Qt must not be forked after initialisation, and spawned multiprocessing workers re-import __main__,
+    which in the application initialises MPI. The workers are therefore started as separate interpreters
+    running the render_worker module, exchanging pickled tasks and results through temporary files.
+    """
+
+    if not tasks:
+        return []
+
+    processes = max(1, min(processes or os.cpu_count() or 1, len(tasks)))
+    bounds = [len(tasks) * i // processes for i in range(processes + 1)]
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [root, os.environ.get("PYTHONPATH")])))
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        workers = []
+        for i, (start, stop) in enumerate(zip(bounds[:-1], bounds[1:])):
+            tasks_path = os.path.join(work_dir, f"tasks_{i}.pickle")
+            results_path = os.path.join(work_dir, f"results_{i}.pickle")
+            with open(tasks_path, "wb") as f:
+                pickle.dump(tasks[start:stop], f)
+            command = [sys.executable, "-m", "visualization.render_worker", tasks_path, results_path]
+            workers.append((subprocess.Popen(command, env=env, stderr=subprocess.PIPE), results_path))
+
+        results = []
+        for worker, results_path in workers:
+            _, stderr = worker.communicate()
+            if worker.returncode != 0:
+                raise RuntimeError(f"Render worker failed:\n{stderr.decode(errors='replace')}")
+            with open(results_path, "rb") as f:
+                results.extend(pickle.load(f))
+        return results
+
+
+def render_batch(individuals, outline, entrances, output_dir, width=DEFAULT_SIZE, height=DEFAULT_SIZE,
+                 prefix="layout", processes=None):
+    """
+    Renders every individual to its own PNG file in parallel, returning the written paths.
+    """
+
+    os.makedirs(output_dir, exist_ok=True)
+    digits = len(str(max(len(individuals) - 1, 0)))
+    tasks = [
+        (individual, outline, entrances, width, height, os.path.join(output_dir, f"{prefix}_{i:0{digits}d}.png"))
+        for i, individual in enumerate(individuals)
+    ]
+    return run_tasks(tasks, processes)
+
+
+def render_sprite_sheet(individuals, outline, entrances, file_path, thumb_size=200, columns=None, processes=None):
+    """
+    Renders individuals as thumbnails in parallel and tiles them row by row into a single PNG.
+    """
+
+    if not individuals:
+        return False
+
+    columns = columns or math.ceil(math.sqrt(len(individuals)))
+    rows = math.ceil(len(individuals) / columns)
+    tasks = [(individual, outline, entrances, thumb_size, thumb_size, None) for individual in individuals]
+    thumbnails = run_tasks(tasks, processes)
+
+    ensure_gui_application()
+    sheet = QImage(columns * thumb_size, rows * thumb_size, QImage.Format_ARGB32)
+    sheet.fill(Qt.white)
+    painter = QPainter(sheet)
+    for i, png in enumerate(thumbnails):
+        thumbnail = QImage.fromData(png, "PNG")
+        painter.drawImage((i % columns) * thumb_size, (i // columns) * thumb_size, thumbnail)
+    painter.end()
+    return sheet.save(file_path, "PNG")
+
+
+def main():
+    from inout.parser import parse_input_file, parse_result_file
+
+    arg_parser = argparse.ArgumentParser(description="Render exported layouts to PNG files without a display.")
+    arg_parser.add_argument("config", help="configuration file the layouts were optimised for")
+    arg_parser.add_argument("results", nargs="+", help="result files saved from the main window")
+    arg_parser.add_argument("-o", "--output", default="renders", help="output directory")
+    arg_parser.add_argument("--size", type=int, default=DEFAULT_SIZE, help="image size in pixels")
+    arg_parser.add_argument("--floor", type=int, default=0, help="floor to render for multi-floor configurations")
+    arg_parser.add_argument("--sprite-sheet", help="also tile all layouts into this PNG file")
+    arg_parser.add_argument("--processes", type=int, default=None, help="number of worker processes")
+    args = arg_parser.parse_args()
+
+    config_data, error = parse_input_file(args.config)
+    if error:
+        sys.exit(error)
+    floor = config_data["floors"][args.floor] if "floors" in config_data else config_data
+
+    individuals = []
+    for path in args.results:
+        individual, error = parse_result_file(path)
+        if error:
+            sys.exit(error)
+        individual.chromosomes = [room for room in individual.chromosomes if room.floor == args.floor]
+        individuals.append(individual)
+
+    outline, entrances = floor["building_constraints"], floor.get("entrances")
+    paths = render_batch(individuals, outline, entrances, args.output, args.size, args.size,
+                         processes=args.processes)
+    print(f"Rendered {len(paths)} layouts to {args.output}")
+
+    if args.sprite_sheet:
+        render_sprite_sheet(individuals, outline, entrances, args.sprite_sheet, processes=args.processes)
+        print(f"Sprite sheet saved to {args.sprite_sheet}")
+
+
+if __name__ == "__main__":
+    main()
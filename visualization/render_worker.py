@@ -0,0 +1,21 @@
+import pickle
+import sys
+
+from .offscreen import render_task
+
+
+def main():
+    """
+    Renders the pickled tasks in the file given as first argument and pickles the results to the second.
+    """
+
+    tasks_path, results_path = sys.argv[1:3]
+    with open(tasks_path, "rb") as f:
+        tasks = pickle.load(f)
+    results = [render_task(task) for task in tasks]
+    with open(results_path, "wb") as f:
+        pickle.dump(results, f)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,104 +1,222 @@
 import sys
+import zlib
 from PyQt5.QtWidgets import QApplication, QMainWindow, QWidget
-from PyQt5.QtGui import QPainter, QColor, QPen, QPolygonF, QFont
+from PyQt5.QtGui import QPainter, QColor, QPen, QPolygonF, QFont, QPixmap
 from PyQt5.QtCore import Qt, QPointF
 
 from genetic.individual import Individual
 
+HIGHLIGHT_PEN_WIDTH = 4
+
 class BuildingWidget(QWidget):
     def __init__(self, individual, building_outline, entrances=None, parent=None):
         super().__init__(parent)
         self.individual = individual
         self.outline = building_outline if building_outline else []
         self.entrances = entrances if entrances else []
+        self.bounds = plan_bounds(individual, self.outline)
+        self.changed_rooms = None
+        self.layer_cache = {}
         self.setMinimumSize(400, 400)
 
-    def update_plan(self, individual, building_outline, entrances=None):
+    def update_plan(self, individual, building_outline, entrances=None, bounds=None, changed_rooms=None):
         """
         Updates the widget with a new floor plan
+
+        Precomputed plan bounds can be passed to skip scanning the rooms, and changed_rooms
+        holds the indices of rooms to highlight.
         """
 
+        entrances = entrances if entrances else []
+        if building_outline != self.outline or entrances != self.entrances:
+            self.layer_cache.clear()
+
         self.individual = individual
         self.outline = building_outline
-        self.entrances = entrances if entrances else []
+        self.entrances = entrances
+        self.bounds = bounds if bounds is not None else plan_bounds(individual, building_outline)
+        self.changed_rooms = changed_rooms
         self.update()
 
+    def resizeEvent(self, event):
+        self.layer_cache.clear()
+        super().resizeEvent(event)
+
+    def static_layers(self, transform):
+        """
+        Returns the cached outline and entrance layers for the current bounds and widget size.
+        """
+
+        key = (self.bounds, self.width(), self.height())
+        if key not in self.layer_cache:
+            outline_layer = QPixmap(self.size())
+            outline_layer.fill(Qt.transparent)
+            painter = QPainter(outline_layer)
+            painter.setRenderHint(QPainter.Antialiasing)
+            paint_outline(painter, self.outline, self.bounds, transform)
+            painter.end()
+
+            entrance_layer = QPixmap(self.size())
+            entrance_layer.fill(Qt.transparent)
+            painter = QPainter(entrance_layer)
+            painter.setRenderHint(QPainter.Antialiasing)
+            paint_entrances(painter, self.entrances, self.bounds, transform)
+            painter.end()
+
+            self.layer_cache[key] = (outline_layer, entrance_layer)
+        return self.layer_cache[key]
+
     def paintEvent(self, event):
         """
         Handles the painting of the widget.
         """
         
+        if not self.outline or self.bounds is None:
+            return
+
+        transform = plan_transform(self.bounds, self.width(), self.height())
+        outline_layer, entrance_layer = self.static_layers(transform)
+
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing)
+        painter.drawPixmap(0, 0, outline_layer)
+        paint_rooms(painter, self.individual, self.bounds, transform, self.changed_rooms)
+        painter.drawPixmap(0, 0, entrance_layer)
 
-        if not self.outline:
-            return
 
-        room_coords_x = []
-        room_coords_y = []
-        if self.individual and self.individual.chromosomes:
-            room_coords_x = [room.x + room.width for room in self.individual.chromosomes]
-            room_coords_y = [room.y + room.height for room in self.individual.chromosomes]
+def room_hue(room_type):
+    """
+    Returns a hue for a room type that is stable across processes, unlike the salted built-in hash.
+    """
 
-        all_x = room_coords_x + [p['x'] for p in self.outline]
-        all_y = room_coords_y + [p['y'] for p in self.outline]
-        
-        if not all_x or not all_y:
-            return
-            
-        plan_min_x = min([p['x'] for p in self.outline])
-        plan_max_x = max(all_x)
-        plan_min_y = min([p['y'] for p in self.outline])
-        plan_max_y = max(all_y)
-        
-        plan_width = plan_max_x - plan_min_x
-        plan_height = plan_max_y - plan_min_y
+    return zlib.crc32(room_type.encode("utf-8")) % 360
 
-        if plan_width == 0 or plan_height == 0:
-            return
-            
-        widget_width = self.width()
-        widget_height = self.height()
-        
-        scale_x = widget_width / plan_width * 0.95
-        scale_y = widget_height / plan_height * 0.95
-        scale = min(scale_x, scale_y)
-
-        scaled_plan_width = plan_width * scale
-        scaled_plan_height = plan_height * scale
-        x_offset = (widget_width - scaled_plan_width) / 2
-        y_offset = (widget_height - scaled_plan_height) / 2
-        
-        painter.setPen(QPen(Qt.gray, 2, Qt.DashLine))
-        painter.setBrush(QColor(230, 230, 230))
+
+def plan_bounds(individual, outline):
+    """
+    Returns the (min_x, min_y, max_x, max_y) extent of a plan, or None if there is nothing to draw.
+    """
+
+    if not outline:
+        return None
+
+    room_coords_x = []
+    room_coords_y = []
+    if individual and individual.chromosomes:
+        room_coords_x = [room.x + room.width for room in individual.chromosomes]
+        room_coords_y = [room.y + room.height for room in individual.chromosomes]
+
+    all_x = room_coords_x + [p['x'] for p in outline]
+    all_y = room_coords_y + [p['y'] for p in outline]
+
+    plan_min_x = min([p['x'] for p in outline])
+    plan_max_x = max(all_x)
+    plan_min_y = min([p['y'] for p in outline])
+    plan_max_y = max(all_y)
+
+    if plan_max_x == plan_min_x or plan_max_y == plan_min_y:
+        return None
+    return plan_min_x, plan_min_y, plan_max_x, plan_max_y
+
+
+def plan_transform(bounds, widget_width, widget_height):
+    """
+    Returns the scale and offsets that fit the plan bounds into the given area.
+    """
+
+    plan_min_x, plan_min_y, plan_max_x, plan_max_y = bounds
+    plan_width = plan_max_x - plan_min_x
+    plan_height = plan_max_y - plan_min_y
+
+    scale_x = widget_width / plan_width * 0.95
+    scale_y = widget_height / plan_height * 0.95
+    scale = min(scale_x, scale_y)
+
+    scaled_plan_width = plan_width * scale
+    scaled_plan_height = plan_height * scale
+    x_offset = (widget_width - scaled_plan_width) / 2
+    y_offset = (widget_height - scaled_plan_height) / 2
+    return scale, x_offset, y_offset
+
+
+def paint_outline(painter, outline, bounds, transform):
+    plan_min_x, plan_min_y = bounds[0], bounds[1]
+    scale, x_offset, y_offset = transform
+
+    painter.setPen(QPen(Qt.gray, 2, Qt.DashLine))
+    painter.setBrush(QColor(230, 230, 230))
+    
+    polygon_points = []
+    for p in outline:
+        px = (p['x'] - plan_min_x) * scale + x_offset
+        py = (p['y'] - plan_min_y) * scale + y_offset
+        polygon_points.append(QPointF(px, py))
         
-        polygon_points = []
-        for p in self.outline:
-            px = (p['x'] - plan_min_x) * scale + x_offset
-            py = (p['y'] - plan_min_y) * scale + y_offset
-            polygon_points.append(QPointF(px, py))
-            
-        polygon = QPolygonF(polygon_points)
-        painter.drawPolygon(polygon)
-
-        if self.individual and self.individual.chromosomes:
-            for room in self.individual.chromosomes:
-                color = QColor.fromHsv(hash(room.room_type) % 360, 255, 200)
-                painter.setBrush(color)
-                painter.setPen(QPen(Qt.black, 2))
-                rect_x = int((room.x - plan_min_x) * scale + x_offset)
-                rect_y = int((room.y - plan_min_y) * scale + y_offset)
-                rect_w = int(room.width * scale)
-                rect_h = int(room.height * scale)
-                painter.drawRect(rect_x, rect_y, rect_w, rect_h)
-                painter.setPen(Qt.black)
-                painter.drawText(rect_x + 5, rect_y + 15, room.room_type)
-
-        painter.setBrush(QColor(0, 255, 0))
-        painter.setPen(QPen(Qt.darkGreen, 2))
-        if self.entrances:
-            for entrance in self.entrances:
-                x = (entrance['x'] - plan_min_x) * scale + x_offset
-                y = (entrance['y'] - plan_min_y) * scale + y_offset
-                size = 6
-                painter.drawEllipse(QPointF(x, y), size, size)
\ No newline at end of file
+    polygon = QPolygonF(polygon_points)
+    painter.drawPolygon(polygon)
+
+
+def paint_rooms(painter, individual, bounds, transform, changed_rooms=None):
+    if not individual or not individual.chromosomes:
+        return
+
+    plan_min_x, plan_min_y = bounds[0], bounds[1]
+    scale, x_offset, y_offset = transform
+
+    for i, room in enumerate(individual.chromosomes):
+        color = QColor.fromHsv(room_hue(room.room_type), 255, 200)
+        painter.setBrush(color)
+        if changed_rooms is not None and i in changed_rooms:
+            painter.setPen(QPen(Qt.red, HIGHLIGHT_PEN_WIDTH))
+        else:
+            painter.setPen(QPen(Qt.black, 2))
+        rect_x = int((room.x - plan_min_x) * scale + x_offset)
+        rect_y = int((room.y - plan_min_y) * scale + y_offset)
+        rect_w = int(room.width * scale)
+        rect_h = int(room.height * scale)
+        painter.drawRect(rect_x, rect_y, rect_w, rect_h)
+        painter.setPen(Qt.black)
+        painter.drawText(rect_x + 5, rect_y + 15, room.room_type)
+
+
+def paint_entrances(painter, entrances, bounds, transform):
+    plan_min_x, plan_min_y = bounds[0], bounds[1]
+    scale, x_offset, y_offset = transform
+
+    painter.setBrush(QColor(0, 255, 0))
+    painter.setPen(QPen(Qt.darkGreen, 2))
+    if entrances:
+        for entrance in entrances:
+            x = (entrance['x'] - plan_min_x) * scale + x_offset
+            y = (entrance['y'] - plan_min_y) * scale + y_offset
+            size = 6
+            painter.drawEllipse(QPointF(x, y), size, size)
+
+
+def changed_room_indices(individual, previous):
+    """
+    Returns the indices of rooms whose type, position or size differ from the previous individual.
+    """
+
+    if individual is None or previous is None:
+        return set()
+    previous_rooms = [room.to_list() for room in previous.chromosomes]
+    return {
+        i for i, room in enumerate(individual.chromosomes)
+        if i >= len(previous_rooms) or room.to_list() != previous_rooms[i]
+    }
+
+
+def paint_plan(painter, widget_width, widget_height, individual, outline, entrances=None):
+    """
+    Paints a floor plan scaled to fit the given area; shared by the widget and offscreen rendering.
+    """
+
+    bounds = plan_bounds(individual, outline)
+    if bounds is None:
+        return
+
+    transform = plan_transform(bounds, widget_width, widget_height)
+    paint_outline(painter, outline, bounds, transform)
+    paint_rooms(painter, individual, bounds, transform)
+    paint_entrances(painter, entrances, bounds, transform)
\ No newline at end of file